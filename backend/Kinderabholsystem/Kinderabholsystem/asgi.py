@@ -2,15 +2,43 @@
 ASGI config for Kinderabholsystem project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Django does not handle the ASGI lifespan protocol, so startup events are
+answered here and used to recover the display state after a restart.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
 
+import logging
 import os
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Kinderabholsystem.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+logger = logging.getLogger(__name__)
+
+
+async def lifespan(receive, send):
+    """Answer lifespan events and restore displayed messages on startup"""
+    from messages_app.views import recover_display
+
+    while True:
+        event = await receive()
+        if event['type'] == 'lifespan.startup':
+            try:
+                await recover_display()
+            except Exception as e:
+                logger.warning("Display recovery failed: %r", e)
+            await send({'type': 'lifespan.startup.complete'})
+        elif event['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,116 @@
+"""
+Archival of old messages into compressed, date-partitioned JSONL files
+
+Messages older than the retention period are moved out of the live table in
+bounded batches. Each batch is appended to one gzip JSONL file per day of
+creation and deleted afterwards, so a crash can duplicate rows in the
+archive but never lose them. Archived rows stay readable through a streaming
+reader that only opens the partitions of the requested date range.
+"""
+
+import gzip
+import json
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Message
+
+# Days a message stays in the live table
+RETENTION_DAYS = getattr(settings, 'MESSAGE_RETENTION_DAYS', 30)
+# Directory holding the archive partitions
+ARCHIVE_DIR = Path(getattr(settings, 'MESSAGE_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'archive'))
+# Rows moved per transaction
+BATCH_SIZE = getattr(settings, 'MESSAGE_ARCHIVE_BATCH_SIZE', 500)
+
+ARCHIVE_FIELDS = ['id', 'content', 'created_at', 'status', 'is_emergency']
+
+
+def partition_path(archive_dir: Path, day: date) -> Path:
+    """Return the archive file for messages created on the given day"""
+    return Path(archive_dir) / f"{day:%Y}" / f"messages-{day:%Y-%m-%d}.jsonl.gz"
+
+
+def serialize_row(row: dict) -> str:
+    """Encode a message row as one JSON line"""
+    return json.dumps({**row, 'created_at': row['created_at'].isoformat()}, ensure_ascii=False) + "\n"
+
+
+def archive_messages(older_than: timedelta = None, archive_dir: Path = ARCHIVE_DIR,
+                     batch_size: int = BATCH_SIZE, pause: float = 0.0) -> tuple:
+    """
+    Move messages older than the retention period into the archive.
+
+    Args:
+        older_than (timedelta): Minimum age of archived messages, defaults to RETENTION_DAYS
+        archive_dir (Path): Directory holding the archive partitions
+        batch_size (int): Rows moved per transaction
+        pause (float): Seconds to sleep between batches to give the API room
+
+    Returns:
+        tuple: (rows moved, seconds taken)
+    """
+    started = time.monotonic()
+    cutoff = timezone.now() - (older_than if older_than is not None else timedelta(days=RETENTION_DAYS))
+    moved = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Message.objects.filter(created_at__lt=cutoff)
+                .order_by('id')
+                .values(*ARCHIVE_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+
+            partitions = {}
+            for row in rows:
+                day = row['created_at'].astimezone(dt_timezone.utc).date()
+                partitions.setdefault(day, []).append(serialize_row(row))
+            for day, lines in partitions.items():
+                path = partition_path(archive_dir, day)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(path, 'at', encoding='utf-8') as f:
+                    f.writelines(lines)
+
+            Message.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+
+        moved += len(rows)
+        if len(rows) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    return moved, time.monotonic() - started
+
+
+def iter_archived_messages(since: datetime = None, until: datetime = None, archive_dir: Path = ARCHIVE_DIR):
+    """
+    Stream archived messages in creation order of their partitions.
+
+    Args:
+        since (datetime): Only messages created at or after this time
+        until (datetime): Only messages created before this time
+        archive_dir (Path): Directory holding the archive partitions
+
+    Yields:
+        dict: Message rows with created_at as aware datetime
+    """
+    for path in sorted(Path(archive_dir).glob("*/messages-*.jsonl.gz")):
+        day = date.fromisoformat(path.name[len("messages-"):len("messages-YYYY-MM-DD")])
+        if since is not None and day < since.astimezone(dt_timezone.utc).date():
+            continue
+        if until is not None and day > until.astimezone(dt_timezone.utc).date():
+            continue
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                row = json.loads(line)
+                row['created_at'] = datetime.fromisoformat(row['created_at'])
+                if since is not None and row['created_at'] < since:
+                    continue
+                if until is not None and row['created_at'] >= until:
+                    continue
+                yield row
@@ -0,0 +1,387 @@
+"""
+Registry of Resolume displays and Raspberry Pi Pico approval stations
+
+Every announcement is fanned out to all registered displays concurrently.
+HTTP calls to the stations go through a bounded worker pool and each call has
+its own timeout, so a slow or unreachable device does not delay the others.
+OSC datagrams never wait for the pool, they are handed to the UDP transport
+right away. Approval requests are
+either broadcast to all stations or assigned to the least-loaded live station.
+Messages that no station accepts are kept and offered again by the live check.
+"""
+
+import asyncio
+import logging
+import time
+from urllib.parse import urlsplit
+from django.conf import settings
+import httpx
+from .osc import OSCTarget
+
+logger = logging.getLogger(__name__)
+
+# Defaults for a single display and approval station
+RESOLUME_IP = "192.168.104.10"  # Resolume software IP address
+RESOLUME_PORT = 7000            # Default OSC port in Resolume
+RESOLUME_LAYER = 6              # Layer holding the announcement text clip
+RASPBERRY_PI_URL = "http://192.168.104.212/"
+
+STATION_TIMEOUT = 5     # Seconds per Raspberry Pi call
+DEVICE_POOL_SIZE = 8    # Maximum number of concurrent station HTTP calls
+
+# Approval strategies
+STRATEGY_BROADCAST = "broadcast"        # Every station gets every message
+STRATEGY_LEAST_LOADED = "least_loaded"  # One station per message, fewest unanswered first
+
+# Seconds between live checks
+STATION_HEALTH_INTERVAL = getattr(settings, 'STATION_HEALTH_INTERVAL', 10)
+# Failed calls in a row before a station counts as down
+STATION_MAX_FAILURES = getattr(settings, 'STATION_MAX_FAILURES', 2)
+LATENCY_ALPHA = 0.3           # Weight of the newest sample in the latency average
+
+_http_client = None
+_http_client_loop = None
+_background_tasks = set()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return a shared async HTTP client bound to the running event loop.
+
+    Reusing one client keeps connections to the Raspberry Pis pooled. A new
+    client is created if the event loop changed (e.g. under a WSGI fallback).
+    """
+    global _http_client, _http_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(timeout=STATION_TIMEOUT)
+        _http_client_loop = loop
+    return _http_client
+
+
+def spawn(coro) -> asyncio.Task:
+    """Run a coroutine in the background and keep a reference until it is done"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def parse_display_target(value: str) -> OSCTarget:
+    """
+    Build an OSCTarget from an "ip[:port[:layer]]" string.
+
+    Args:
+        value (str): Address of the Resolume instance
+
+    Returns:
+        OSCTarget: Target for the announcement layer
+    """
+    parts = value.strip().split(":")
+    ip = parts[0]
+    port = int(parts[1]) if len(parts) > 1 else RESOLUME_PORT
+    layer = int(parts[2]) if len(parts) > 2 else RESOLUME_LAYER
+    return OSCTarget(ip, port, layer)
+
+
+class ApprovalStation:
+    """
+    Raspberry Pi Pico with accept and reject buttons.
+
+    Args:
+        url (str): Base URL of the Pico's HTTP server
+    """
+
+    def __init__(self, url: str):
+        self.url = url.strip() if url.strip().endswith("/") else url.strip() + "/"
+        self.host = urlsplit(self.url).hostname
+        self.live_url = self.url + "live"
+        self.withdraw_url = self.url + "withdraw"
+        self.pending = set()    # Message pks waiting for a decision on this station
+        self.latency = None     # Moving average of the response time in seconds
+        self.failures = 0       # Failed calls in a row
+        self.live = True
+
+    def __repr__(self):
+        return f"ApprovalStation({self.url!r})"
+
+    @property
+    def load(self) -> tuple:
+        """Sort key for load balancing: unanswered messages, then response time"""
+        return (len(self.pending), self.latency or 0.0)
+
+    def stats(self) -> dict:
+        """Health and load figures of this station"""
+        return {
+            "live": self.live,
+            "pending": len(self.pending),
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+        }
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.monotonic()
+        try:
+            response = await get_http_client().request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self._record_failure()
+            raise
+        elapsed = time.monotonic() - started
+        if response.status_code >= 500:
+            self._record_failure()
+        else:
+            self.latency = elapsed if self.latency is None else \
+                LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * self.latency
+            self.failures = 0
+            self.live = True
+        return response
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= STATION_MAX_FAILURES and self.live:
+            self.live = False
+            logger.warning("Approval station %s stopped answering", self.host)
+
+    async def send_message(self, content: str, pk: int) -> bool:
+        """Forward a message for approval, True if the Pico accepted it"""
+        response = await self._request("POST", self.url, json={"id": pk, "message": content})
+        if response.status_code != 200:
+            print(f"RPi communication error ({self.host}): {response.status_code}")
+        return response.status_code == 200
+
+    async def withdraw(self, pk: int) -> bool:
+        """Remove a message that was decided on another station"""
+        response = await self._request("POST", self.withdraw_url, json={"id": pk})
+        return response.status_code == 200
+
+    async def is_live(self) -> bool:
+        """Check the run state of the Pico"""
+        response = await self._request("GET", self.live_url)
+        return response.status_code == 200
+
+
+class DeviceRegistry:
+    """
+    Displays and approval stations that take part in every announcement.
+
+    Args:
+        displays (list): OSCTargets for announcements
+        stations (list): ApprovalStations for button approval
+        emergency_displays (list): OSCTargets for emergencies, defaults to displays
+        pool_size (int): Maximum number of concurrent station HTTP calls
+        strategy (str): STRATEGY_LEAST_LOADED or STRATEGY_BROADCAST
+
+    Attributes:
+        on_assigned: Coroutine function called with the message pk once a
+            message that no station accepted at first was placed by a retry.
+    """
+
+    def __init__(self, displays, stations, emergency_displays=None, pool_size=DEVICE_POOL_SIZE,
+                 strategy=STRATEGY_LEAST_LOADED):
+        self.displays = displays
+        self.stations = stations
+        self.emergency_displays = emergency_displays or displays
+        self.pool_size = pool_size
+        self.strategy = strategy
+        self.holders = {}   # Message pk -> stations that received it
+        self.contents = {}  # Message pk -> content, kept until decided for reassignment
+        self.unassigned = {}  # Message pk -> content, not accepted by any station yet
+        self.on_assigned = None
+        self._pool = None
+        self._monitor = None
+
+    @classmethod
+    def from_settings(cls) -> "DeviceRegistry":
+        """Build the registry from DISPLAY_TARGETS and APPROVAL_STATIONS"""
+        default_display = f"{RESOLUME_IP}:{RESOLUME_PORT}:{RESOLUME_LAYER}"
+        displays = [parse_display_target(value)
+                    for value in getattr(settings, 'DISPLAY_TARGETS', [default_display]) if value.strip()]
+        stations = [ApprovalStation(url)
+                    for url in getattr(settings, 'APPROVAL_STATIONS', [RASPBERRY_PI_URL]) if url.strip()]
+
+        emergency_address = (
+            getattr(settings, 'EMERGENCY_RESOLUME_IP', None),
+            getattr(settings, 'EMERGENCY_RESOLUME_PORT', RESOLUME_PORT),
+            getattr(settings, 'EMERGENCY_RESOLUME_LAYER', RESOLUME_LAYER),
+        )
+        emergency_displays = None
+        if emergency_address[0] and not any(
+                (t.client.address, t.client.port, t.layer) == emergency_address for t in displays):
+            emergency_displays = [OSCTarget(*emergency_address)]
+
+        return cls(displays, stations, emergency_displays,
+                   getattr(settings, 'DEVICE_POOL_SIZE', DEVICE_POOL_SIZE),
+                   getattr(settings, 'APPROVAL_STRATEGY', STRATEGY_LEAST_LOADED))
+
+    async def _bounded(self, coro):
+        if self._pool is None:
+            self._pool = asyncio.Semaphore(self.pool_size)
+        async with self._pool:
+            return await coro
+
+    async def fan_out(self, devices, call, bounded: bool = True) -> list:
+        """
+        Run call(device) for every device concurrently.
+
+        Args:
+            devices (list): Devices to call
+            call: Coroutine function taking a device
+            bounded (bool): Limit concurrency with the worker pool. Only HTTP
+                calls need it, OSC sends pass False so they never queue behind
+                stations that wait for their timeout.
+
+        Returns:
+            list: Results in device order, exceptions are returned instead of raised
+        """
+        wrap = self._bounded if bounded else (lambda coro: coro)
+        return await asyncio.gather(*(wrap(call(device)) for device in devices),
+                                    return_exceptions=True)
+
+    async def forward_message(self, content: str, pk: int) -> list:
+        """
+        Send a message to the approval stations according to the strategy.
+
+        Returns:
+            list: Stations that accepted the message, empty if none did
+
+        A message that no station accepted, e.g. because every queue is full
+        or every station is unreachable, is queued for retry_unassigned.
+        """
+        self.start_monitor()
+        self.contents[pk] = content
+        if self.strategy == STRATEGY_BROADCAST:
+            results = await self.fan_out(self.stations, lambda station: station.send_message(content, pk))
+            accepted = []
+            for station, result in zip(self.stations, results):
+                if isinstance(result, Exception):
+                    print(f"RPi connection failed ({station.host}): {result!r}")
+                elif result:
+                    station.pending.add(pk)
+                    accepted.append(station)
+            if accepted:
+                self.holders[pk] = accepted
+        else:
+            accepted = await self._assign(content, pk)
+
+        if accepted:
+            self.unassigned.pop(pk, None)
+        else:
+            self.unassigned[pk] = content
+            logger.warning("No approval station accepted message %s, queued for retry", pk)
+        return accepted
+
+    async def retry_unassigned(self) -> list:
+        """
+        Offer the messages that no station accepted to the stations again, oldest first.
+
+        Returns:
+            list: Primary keys of the messages that were placed
+        """
+        placed = []
+        for pk, content in list(self.unassigned.items()):
+            if pk not in self.unassigned:
+                continue  # Decided while an earlier message was retried
+            if await self.forward_message(content, pk):
+                placed.append(pk)
+                if self.on_assigned:
+                    await self.on_assigned(pk)
+        return placed
+
+    async def _assign(self, content: str, pk: int, exclude=()) -> list:
+        """
+        Hand a message to the least-loaded live station.
+
+        Stations are tried in order of unanswered messages and response time
+        until one accepts. Stations marked down are only tried if no live
+        station is left.
+        """
+        candidates = [station for station in self.stations if station not in exclude]
+        live = [station for station in candidates if station.live]
+        for station in sorted(live or candidates, key=lambda station: station.load):
+            try:
+                accepted = await self._bounded(station.send_message(content, pk))
+            except Exception as e:
+                print(f"RPi connection failed ({station.host}): {e!r}")
+                continue
+            if accepted:
+                station.pending.add(pk)
+                self.holders[pk] = [station]
+                return [station]
+        return []
+
+    async def withdraw_message(self, pk: int, decided_by: str = None) -> None:
+        """
+        Withdraw a decided message from every station except the deciding one.
+
+        Args:
+            pk (int): Primary key of Message object
+            decided_by (str): IP address of the station that decided
+        """
+        self.contents.pop(pk, None)
+        self.unassigned.pop(pk, None)
+        holders = self.holders.pop(pk, [])
+        for station in holders:
+            station.pending.discard(pk)
+        stations = [station for station in holders if station.host != decided_by]
+        results = await self.fan_out(stations, lambda station: station.withdraw(pk))
+        for station, result in zip(stations, results):
+            if isinstance(result, Exception) or not result:
+                logger.warning("Could not withdraw message %s from %s: %r", pk, station.host, result)
+
+    async def check_stations(self) -> dict:
+        """
+        Check every approval station and return its health and load keyed by URL.
+
+        "reachable" is the result of this check. "live" is the damped state
+        used for assignment, which only turns False after STATION_MAX_FAILURES
+        failed calls in a row.
+        """
+        results = await self.fan_out(self.stations, lambda station: station.is_live())
+        stations = {}
+        for station, result in zip(self.stations, results):
+            stations[station.url] = dict(station.stats(), reachable=result is True)
+        return stations
+
+    def start_monitor(self) -> None:
+        """Start the background live check if it is not running yet"""
+        if self._monitor is None or self._monitor.done():
+            self._monitor = spawn(self._monitor_stations())
+
+    async def _monitor_stations(self) -> None:
+        while True:
+            await asyncio.sleep(STATION_HEALTH_INTERVAL)
+            try:
+                await self.check_stations()
+                for station in self.stations:
+                    if not station.live and station.pending:
+                        await self.reassign(station)
+                if self.unassigned:
+                    await self.retry_unassigned()
+            except Exception as e:
+                logger.warning("Station monitor error: %r", e)
+
+    async def reassign(self, station: ApprovalStation) -> None:
+        """
+        Move the unanswered messages of a station that stopped answering.
+
+        Messages that are still held by another station (broadcast) stay there,
+        all others are assigned to the least-loaded remaining live station or,
+        if none accepts them, queued for retry_unassigned.
+        """
+        for pk in list(station.pending):
+            station.pending.discard(pk)
+            holders = self.holders.get(pk, [])
+            if station in holders:
+                holders.remove(station)
+            content = self.contents.get(pk)
+            if holders or content is None:
+                continue
+            accepted = await self._assign(content, pk, exclude=(station,))
+            if accepted:
+                print(f"Message {pk} reassigned from {station.host} to {accepted[0].host}")
+            else:
+                self.unassigned[pk] = content
+                logger.warning("Message %s could not be reassigned from %s, queued for retry", pk, station.host)
+
+
+registry = DeviceRegistry.from_settings()
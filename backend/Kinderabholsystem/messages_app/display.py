@@ -0,0 +1,254 @@
+"""
+Display scheduling for announcements shown in Resolume Arena
+
+Only one announcement is on screen at a time. Emergencies form a priority
+lane: they preempt a normal announcement immediately, and the preempted
+announcement resumes with its remaining time once the emergency is over.
+Announcements longer than one text clip are split into pages that cycle
+across the clips of the layer. The clear deadline of every announcement on
+screen is reported to on_started and every announcement that waits in the
+queue to on_queued, so both can be persisted and recovered after a restart.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from .devices import registry
+from .layout import clip_for_page, paginate
+
+logger = logging.getLogger(__name__)
+
+# Priorities, lower values are shown first
+PRIORITY_EMERGENCY = 0
+PRIORITY_NORMAL = 1
+
+DISPLAY_DURATION = 120  # Seconds an announcement stays visible
+
+# Seconds each page of a multi-page announcement stays visible
+PAGE_INTERVAL = getattr(settings, 'OSC_PAGE_INTERVAL', 8)
+
+# Maximum time from request to OSC emit for emergencies
+EMERGENCY_LATENCY_BUDGET_MS = getattr(settings, 'EMERGENCY_LATENCY_BUDGET_MS', 250)
+
+
+async def send_osc_message(message: str, opacity: float, targets: list = None, clip: int = 1) -> None:
+    """
+    Send OSC message to Resolume Arena to control text display.
+
+    Args:
+        message (str): Text content to display
+        opacity (float): Layer opacity (0.0-1.0), 0.0 clears the layer
+        targets (list): OSCTargets to write to, defaults to all registered displays
+        clip (int): Clip that shows the text
+
+    Writes to every target concurrently and without the station worker
+    pool, so slow Raspberry Pi calls never delay a display update. Unchanged
+    values are suppressed by the shadow state of each target's client.
+    """
+    opacity = float(opacity)
+
+    async def send(target):
+        if opacity == 0.0:
+            return await target.clear()
+        return await target.show(clip, message, opacity)
+
+    targets = registry.displays if targets is None else targets
+    results = await registry.fan_out(targets, send, bounded=False)
+    for target, result in zip(targets, results):
+        if isinstance(result, Exception):
+            print(f"OSC communication error ({target.client.address}): {result}")
+    print(f"Sent OSC message: {message}")
+
+
+class DisplayItem:
+    """
+    Announcement waiting for or occupying the display.
+
+    Args:
+        text (str): Final text shown in Resolume
+        priority (int): PRIORITY_EMERGENCY or PRIORITY_NORMAL
+        duration (float): Display duration in seconds
+        message_pk (int): Primary key of the Message object, if any
+        requested_at (float): time.monotonic() of the request, used for latency measurement
+    """
+
+    def __init__(self, text: str, priority: int = PRIORITY_NORMAL, duration: float = DISPLAY_DURATION,
+                 message_pk: int = None, requested_at: float = None):
+        self.text = text
+        self.priority = priority
+        self.remaining = duration
+        self.message_pk = message_pk
+        self.requested_at = time.monotonic() if requested_at is None else requested_at
+        self.emitted_at = None
+        self.pages = paginate(text)
+        self.page_index = 0
+
+    @property
+    def targets(self) -> list:
+        """Resolume layers for this announcement"""
+        return registry.emergency_displays if self.priority == PRIORITY_EMERGENCY else registry.displays
+
+
+class DisplayScheduler:
+    """
+    Priority queue in front of the Resolume display.
+
+    Args:
+        on_finished: Coroutine function called with the message pk once an
+            announcement has been shown for its full duration, cleared or
+            replaced by another announcement.
+        on_started: Coroutine function called with the message pk and the
+            wall-clock clear deadline whenever an announcement goes on screen.
+        on_queued: Coroutine function called with the message pk whenever an
+            announcement has to wait, behind an emergency or because it was
+            preempted by one.
+    """
+
+    def __init__(self, on_finished=None, on_started=None, on_queued=None):
+        self.on_finished = on_finished
+        self.on_started = on_started
+        self.on_queued = on_queued
+        self.current = None
+        self.emergency_latencies_ms = deque(maxlen=50)
+        self._pending = []
+        self._counter = itertools.count()
+        self._task = None
+        self._shown_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def show(self, item: DisplayItem) -> None:
+        """
+        Show an announcement, preempting the current one if allowed.
+
+        A normal announcement replaces another normal announcement but waits
+        behind an emergency. An emergency always goes on screen immediately.
+        """
+        async with self._lock:
+            current = self.current
+            if current is not None and current.priority < item.priority:
+                self._push(item)
+                await self._queued(item)
+                return
+            if current is not None:
+                requeue = current.priority > item.priority
+                self._stop_current(requeue=requeue)
+                if requeue:
+                    await self._queued(current)
+                if current.targets is not item.targets:
+                    await send_osc_message("", "0.0", current.targets)
+                if not requeue and current.message_pk and self.on_finished:
+                    await self.on_finished(current.message_pk)
+            await self._start(item)
+
+    async def enqueue(self, item: DisplayItem) -> None:
+        """
+        Queue an announcement behind the current one without preempting it.
+
+        The announcement goes on screen right away if nothing is shown. Used
+        to restore the queue after a restart.
+        """
+        async with self._lock:
+            self._push(item)
+            await self._next()
+
+    async def clear(self) -> DisplayItem:
+        """
+        End the current announcement immediately.
+
+        Returns:
+            DisplayItem: The cleared announcement, or None if nothing was shown
+
+        Announcements preempted by the cleared one resume afterwards.
+        """
+        async with self._lock:
+            item = self.current
+            if item is not None:
+                self._stop_current(requeue=False)
+            await send_osc_message("", "0.0", item.targets if item else None)
+            if item is not None and item.message_pk and self.on_finished:
+                await self.on_finished(item.message_pk)
+            await self._next()
+        return item
+
+    def stats(self) -> dict:
+        """Current announcement, queue length, emergency latencies and OSC update counters"""
+        targets = registry.displays + [t for t in registry.emergency_displays if t not in registry.displays]
+        return {
+            "current": self.current.text if self.current else None,
+            "pending": len(self._pending),
+            "emergency_latencies_ms": [round(latency, 1) for latency in self.emergency_latencies_ms],
+            "osc": {f"{t.client.address}:{t.client.port}/{t.layer}": t.client.stats() for t in targets},
+        }
+
+    def _push(self, item: DisplayItem) -> None:
+        heapq.heappush(self._pending, (item.priority, next(self._counter), item))
+
+    async def _queued(self, item: DisplayItem) -> None:
+        if item.message_pk and self.on_queued:
+            await self.on_queued(item.message_pk)
+
+    def _stop_current(self, requeue: bool) -> None:
+        current = self.current
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if requeue:
+            current.remaining = max(0.0, current.remaining - (time.monotonic() - self._shown_at))
+            self._push(current)
+        self.current = None
+
+    async def _start(self, item: DisplayItem) -> None:
+        self.current = item
+        self._shown_at = time.monotonic()
+        await self._show_page(item)
+
+        if item.emitted_at is None:
+            item.emitted_at = time.monotonic()
+            if item.priority == PRIORITY_EMERGENCY:
+                latency_ms = (item.emitted_at - item.requested_at) * 1000
+                self.emergency_latencies_ms.append(latency_ms)
+                if latency_ms > EMERGENCY_LATENCY_BUDGET_MS:
+                    logger.warning("Emergency display latency %.1f ms exceeds budget of %d ms",
+                                   latency_ms, EMERGENCY_LATENCY_BUDGET_MS)
+                else:
+                    logger.info("Emergency display latency %.1f ms", latency_ms)
+
+        if item.message_pk and self.on_started:
+            await self.on_started(item.message_pk, timezone.now() + timedelta(seconds=item.remaining))
+        self._task = asyncio.create_task(self._expire(item))
+
+    async def _show_page(self, item: DisplayItem) -> None:
+        await send_osc_message(item.pages[item.page_index], "1.0", item.targets,
+                               clip=clip_for_page(item.page_index))
+
+    async def _expire(self, item: DisplayItem) -> None:
+        try:
+            deadline = time.monotonic() + item.remaining
+            while len(item.pages) > 1 and deadline - time.monotonic() > PAGE_INTERVAL:
+                await asyncio.sleep(PAGE_INTERVAL)
+                item.page_index = (item.page_index + 1) % len(item.pages)
+                await self._show_page(item)
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+        except asyncio.CancelledError:
+            print("Message display interrupted")
+            raise
+
+        async with self._lock:
+            self._task = None
+            self.current = None
+            await send_osc_message("", "0.0", item.targets)
+            if item.message_pk and self.on_finished:
+                await self.on_finished(item.message_pk)
+                print(f"Updated message {item.message_pk} to 'displayed' status")
+            await self._next()
+
+    async def _next(self) -> None:
+        if self.current is None and self._pending:
+            _, _, item = heapq.heappop(self._pending)
+            await self._start(item)
@@ -0,0 +1,125 @@
+"""
+Streaming export of the message history as CSV or JSONL
+
+Rows are read from the archive partitions and the live table in chunks and
+encoded chunk by chunk, so memory use stays flat for any date range.
+"""
+
+import csv
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.utils.dateparse import parse_date, parse_datetime
+from .archive import ARCHIVE_FIELDS, iter_archived_messages, serialize_row
+from .models import Message
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_FIELDS = ARCHIVE_FIELDS
+CHUNK_SIZE = 2000  # Rows fetched and encoded per chunk
+
+
+def parse_bound(value: str) -> datetime:
+    """
+    Parse an export range bound given as date or datetime.
+
+    Args:
+        value (str): ISO date ("2025-02-01") or datetime
+
+    Returns:
+        datetime: Aware datetime, dates mean midnight UTC, None for empty values
+
+    Raises:
+        ValueError: If the value is not a valid date or datetime
+    """
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value}")
+        parsed = datetime.combine(day, dt_time.min)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def live_queryset(since: datetime = None, until: datetime = None):
+    """Rows of the live table in the range, oldest first"""
+    queryset = Message.objects.order_by('created_at', 'id')
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(created_at__lt=until)
+    return queryset.values(*EXPORT_FIELDS)
+
+
+def iter_rows(since: datetime = None, until: datetime = None, include_archive: bool = True):
+    """Yield archived rows followed by live rows in the range"""
+    if include_archive:
+        yield from iter_archived_messages(since, until)
+    yield from live_queryset(since, until).iterator(chunk_size=CHUNK_SIZE)
+
+
+async def aiter_rows(since: datetime = None, until: datetime = None, include_archive: bool = True):
+    """Async variant of iter_rows, archive files are read in a worker thread chunk by chunk"""
+    if include_archive:
+        archived = iter_archived_messages(since, until)
+        next_chunk = sync_to_async(lambda: list(islice(archived, CHUNK_SIZE)), thread_sensitive=False)
+        while chunk := await next_chunk():
+            for row in chunk:
+                yield row
+    async for row in live_queryset(since, until).aiterator(chunk_size=CHUNK_SIZE):
+        yield row
+
+
+class _Echo:
+    """File-like object that returns what is written, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def encode_row(row: dict, output_format: str, writer=None) -> str:
+    """Encode one row as CSV line or JSON line"""
+    if output_format == 'csv':
+        return writer.writerow([row['created_at'].isoformat() if key == 'created_at' else row[key]
+                                for key in EXPORT_FIELDS])
+    return serialize_row(row)
+
+
+def encode(rows, output_format: str):
+    """
+    Encode rows into text chunks of CHUNK_SIZE rows.
+
+    Args:
+        rows: Iterable of message rows
+        output_format (str): "csv" or "jsonl"
+
+    Yields:
+        str: Encoded chunks, the CSV header comes first
+    """
+    writer = csv.writer(_Echo())
+    if output_format == 'csv':
+        yield writer.writerow(EXPORT_FIELDS)
+    rows = iter(rows)
+    while chunk := list(islice(rows, CHUNK_SIZE)):
+        yield "".join(encode_row(row, output_format, writer) for row in chunk)
+
+
+async def aencode(rows, output_format: str):
+    """Async variant of encode for async row iterators"""
+    writer = csv.writer(_Echo())
+    if output_format == 'csv':
+        yield writer.writerow(EXPORT_FIELDS)
+    chunk = []
+    async for row in rows:
+        chunk.append(encode_row(row, output_format, writer))
+        if len(chunk) >= CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
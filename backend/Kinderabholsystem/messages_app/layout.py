@@ -0,0 +1,68 @@
+"""
+Text layout for Resolume text clips
+
+Long announcements are word-wrapped against the capacity of a text clip and
+split into pages, which are shown on consecutive clips of the layer.
+"""
+
+from django.conf import settings
+
+# Capacity of a single text clip
+CHARS_PER_LINE = getattr(settings, 'OSC_CHARS_PER_LINE', 40)
+LINES_PER_PAGE = getattr(settings, 'OSC_LINES_PER_PAGE', 3)
+# Number of text clips available on the layer
+CLIP_COUNT = getattr(settings, 'OSC_CLIP_COUNT', 20)
+
+
+def wrap_lines(text: str, chars_per_line: int = CHARS_PER_LINE) -> list:
+    """
+    Word-wrap text into lines of at most chars_per_line characters.
+
+    Args:
+        text (str): Text to wrap
+        chars_per_line (int): Maximum characters per line
+
+    Returns:
+        list: Lines without trailing whitespace, words longer than a line are split
+    """
+    lines = []
+    line = ""
+    for word in text.split():
+        while len(word) > chars_per_line:
+            if line:
+                lines.append(line)
+                line = ""
+            lines.append(word[:chars_per_line])
+            word = word[chars_per_line:]
+        if not line:
+            line = word
+        elif len(line) + 1 + len(word) <= chars_per_line:
+            line += " " + word
+        else:
+            lines.append(line)
+            line = word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def paginate(text: str, chars_per_line: int = CHARS_PER_LINE, lines_per_page: int = LINES_PER_PAGE) -> list:
+    """
+    Split text into pages that fit a single text clip.
+
+    Args:
+        text (str): Text to lay out
+        chars_per_line (int): Maximum characters per line
+        lines_per_page (int): Maximum lines per text clip
+
+    Returns:
+        list: Page texts with lines joined by newlines, at least one (possibly empty) page
+    """
+    lines = wrap_lines(text, chars_per_line)
+    pages = ["\n".join(lines[i:i + lines_per_page]) for i in range(0, len(lines), lines_per_page)]
+    return pages or [""]
+
+
+def clip_for_page(index: int, clip_count: int = CLIP_COUNT) -> int:
+    """Return the 1-based clip number that shows the page with the given index"""
+    return index % clip_count + 1
@@ -0,0 +1,29 @@
+from datetime import timedelta
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from messages_app.archive import archive_messages, ARCHIVE_DIR, BATCH_SIZE, RETENTION_DAYS
+
+
+class Command(BaseCommand):
+    """Move old messages from the live table into the gzip JSONL archive"""
+
+    help = "Archive messages older than the retention period into date-partitioned gzip JSONL files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=RETENTION_DAYS,
+                            help=f"Archive messages older than this many days (default: {RETENTION_DAYS})")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f"Rows moved per transaction (default: {BATCH_SIZE})")
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help="Seconds to sleep between batches (default: 0)")
+        parser.add_argument('--archive-dir', type=Path, default=ARCHIVE_DIR,
+                            help=f"Archive directory (default: {ARCHIVE_DIR})")
+
+    def handle(self, *args, **options):
+        moved, seconds = archive_messages(
+            older_than=timedelta(days=options['days']),
+            archive_dir=options['archive_dir'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} messages in {seconds:.2f}s"))
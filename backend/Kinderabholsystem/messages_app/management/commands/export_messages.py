@@ -0,0 +1,45 @@
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from messages_app.export import EXPORT_FORMATS, encode, iter_rows, parse_bound
+
+
+class Command(BaseCommand):
+    """Stream the message history including the archive as CSV or JSONL"""
+
+    help = "Export messages with their timestamps as CSV or JSONL, streaming rows chunk by chunk."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-format', choices=sorted(EXPORT_FORMATS), default='csv',
+                            help="Output format (default: csv)")
+        parser.add_argument('--since', help="Only messages created at or after this date or datetime")
+        parser.add_argument('--until', help="Only messages created before this date or datetime")
+        parser.add_argument('--no-archive', action='store_true',
+                            help="Skip archived messages and export the live table only")
+        parser.add_argument('--output', help="Output file (default: stdout)")
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_bound(options['since'])
+            until = parse_bound(options['until'])
+        except ValueError as e:
+            raise CommandError(e)
+
+        started = time.monotonic()
+        counted = {'rows': 0}
+
+        def count(rows):
+            for row in rows:
+                counted['rows'] += 1
+                yield row
+
+        out = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            rows = count(iter_rows(since, until, not options['no_archive']))
+            for chunk in encode(rows, options['output_format']):
+                out.write(chunk)
+        finally:
+            if options['output']:
+                out.close()
+
+        self.stderr.write(f"Exported {counted['rows']} messages in {time.monotonic() - started:.2f}s")
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:08
+
+from django.db import migrations, models
+
+
+def flag_existing_emergencies(apps, schema_editor):
+    # Emergencies used to be recognised by their text prefix only
+    Message = apps.get_model('messages_app', 'Message')
+    Message.objects.filter(content__startswith='Medizinischer Notfall:').update(is_emergency=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='is_emergency',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='status',
+            field=models.CharField(choices=[('received', 'Received'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('sent', 'Sent'), ('displayed', 'Displayed')], default='sent', max_length=10),
+        ),
+        migrations.RunPython(flag_existing_emergencies, migrations.RunPython.noop),
+    ]
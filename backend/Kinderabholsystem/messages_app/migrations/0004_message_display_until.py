@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0003_alter_message_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='display_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -2,10 +2,13 @@ from django.db import models
 
 class Message(models.Model):
     content = models.CharField(max_length=255)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     status = models.CharField(
         max_length=10,
         choices=[('received', 'Received'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('sent', 'Sent'),  ('displayed', 'Displayed')],
         default='sent'
     )
+    is_emergency = models.BooleanField(default=False)
+    # Clear deadline while the message is on screen, used to recover the display after a restart
+    display_until = models.DateTimeField(null=True, blank=True)
 
@@ -0,0 +1,204 @@
+"""
+Non-blocking OSC transport for Resolume Arena
+"""
+
+import asyncio
+import logging
+from django.conf import settings
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+logger = logging.getLogger(__name__)
+
+# Seconds between full resends of all shadowed OSC values, 0 disables the resync
+RESYNC_INTERVAL = getattr(settings, 'OSC_RESYNC_INTERVAL', 30)
+
+
+class _OSCProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that only reports transport errors"""
+
+    def error_received(self, exc: Exception) -> None:
+        logger.warning("OSC transport error: %s", exc)
+
+
+class AsyncUDPClient:
+    """
+    OSC client sending datagrams through an asyncio UDP transport.
+
+    Drop-in async counterpart of ``pythonosc.udp_client.SimpleUDPClient``.
+    The transport is created lazily on the running event loop, so the client
+    can be instantiated at import time and is recreated if the loop changes.
+    """
+
+    def __init__(self, address: str, port: int):
+        self.address = address
+        self.port = port
+        self._transport = None
+        self._loop = None
+
+    async def _get_transport(self) -> asyncio.DatagramTransport:
+        loop = asyncio.get_running_loop()
+        if self._transport is None or self._transport.is_closing() or self._loop is not loop:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                _OSCProtocol,
+                remote_addr=(self.address, self.port)
+            )
+            self._loop = loop
+        return self._transport
+
+    async def send_message(self, address: str, value) -> None:
+        """
+        Build an OSC message and hand it to the UDP transport without blocking.
+
+        Args:
+            address (str): OSC address pattern
+            value: Single argument or list of arguments
+        """
+        builder = OscMessageBuilder(address=address)
+        values = value if isinstance(value, list) else [value]
+        for arg in values:
+            builder.add_arg(arg)
+        transport = await self._get_transport()
+        transport.sendto(builder.build().dgram)
+
+    def close(self) -> None:
+        """Close the underlying transport"""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+class ShadowUDPClient(AsyncUDPClient):
+    """
+    OSC client that only sends values which differ from the last one sent.
+
+    A shadow copy of the last value per OSC address suppresses redundant
+    updates. Because UDP packets can be lost, all shadowed values are resent
+    every resync_interval seconds. Triggers such as clip connects are actions
+    rather than state, they are sent with shadow=False and never resent.
+
+    Args:
+        address (str): Receiver IP address
+        port (int): Receiver port
+        resync_interval (float): Seconds between full resends, 0 disables it
+    """
+
+    def __init__(self, address: str, port: int, resync_interval: float = RESYNC_INTERVAL):
+        super().__init__(address, port)
+        self.resync_interval = resync_interval
+        self.shadow = {}
+        self.sent = 0
+        self.suppressed = 0
+        self.resynced = 0
+        self._resync_task = None
+
+    async def send_message(self, address: str, value, force: bool = False, shadow: bool = True) -> bool:
+        """
+        Send a value unless the receiver already has it.
+
+        Args:
+            address (str): OSC address pattern
+            value: Single argument or list of arguments
+            force (bool): Send even if the value did not change
+            shadow (bool): Remember the value for suppression and resync, False for triggers
+
+        Returns:
+            bool: True if a datagram was sent, False if it was suppressed
+        """
+        if not shadow:
+            await super().send_message(address, value)
+            self.sent += 1
+            return True
+        previous = self.shadow.get(address)
+        if not force and address in self.shadow and type(previous) is type(value) and previous == value:
+            self.suppressed += 1
+            return False
+        await super().send_message(address, value)
+        self.shadow[address] = value
+        self.sent += 1
+        self._start_resync()
+        return True
+
+    def stats(self) -> dict:
+        """Counters of sent, suppressed and resynced updates"""
+        return {"sent": self.sent, "suppressed": self.suppressed, "resynced": self.resynced}
+
+    def _start_resync(self) -> None:
+        if not self.resync_interval:
+            return
+        if self._resync_task is None or self._resync_task.done() or \
+                self._resync_task.get_loop() is not asyncio.get_running_loop():
+            self._resync_task = asyncio.create_task(self._resync())
+
+    async def _resync(self) -> None:
+        while True:
+            await asyncio.sleep(self.resync_interval)
+            try:
+                for address, value in list(self.shadow.items()):
+                    await AsyncUDPClient.send_message(self, address, value)
+                    self.resynced += 1
+                logger.debug("OSC resync %s: %s", self.address, self.stats())
+            except Exception as e:
+                logger.warning("OSC resync error: %s", e)
+
+
+class OSCTarget:
+    """
+    Text layer of a Resolume Arena composition reachable via OSC.
+
+    Unchanged texts and opacity are suppressed by the shadow state of the
+    client. Connects are triggers, so they are sent unshadowed and only when
+    the connected clip or its value changes.
+
+    Args:
+        ip (str): Resolume software IP address
+        port (int): OSC port configured in Resolume
+        layer (int): Layer holding the text clips
+        clip (int): Clip used for single-page announcements
+    """
+
+    def __init__(self, ip: str, port: int, layer: int, clip: int = 1):
+        self.client = ShadowUDPClient(ip, port)
+        self.layer = layer
+        self.opacity_path = f"/composition/layers/{layer}/video/opacity"
+        self.text_path = self.text_path_for(clip)
+        self.connect_path = self.connect_path_for(clip)
+        self.clips = set()          # Clips that received text
+        self.connected_clip = clip  # Clip that was connected last
+        self.connected = None       # (clip, value) of the last connect sent
+
+    def text_path_for(self, clip: int) -> str:
+        """OSC address of the textblock lines of a clip"""
+        return f"/composition/layers/{self.layer}/clips/{clip}/video/effects/textblock/effect/text/params/lines"
+
+    def connect_path_for(self, clip: int) -> str:
+        """OSC address to connect a clip"""
+        return f"/composition/layers/{self.layer}/clips/{clip}/connect"
+
+    async def show(self, clip: int, text: str, opacity: float) -> None:
+        """
+        Show text on a clip.
+
+        Args:
+            clip (int): Clip number
+            text (str): Text for the clip
+            opacity (float): Layer opacity (0.0-1.0)
+        """
+        self.clips.add(clip)
+        await self.client.send_message(self.text_path_for(clip), text)
+        await self.client.send_message(self.opacity_path, opacity)
+        await self._connect(clip, int(opacity))
+
+    async def clear(self) -> None:
+        """Hide the layer and empty every clip that received text"""
+        for clip in sorted(self.clips) or [self.connected_clip]:
+            await self.client.send_message(self.text_path_for(clip), "")
+        await self.client.send_message(self.opacity_path, 0.0)
+        await self._connect(self.connected_clip, 0)
+
+    async def _connect(self, clip: int, value: int) -> None:
+        # Resolume retriggers a clip on every connect, so repeats are skipped
+        self.connected_clip = clip
+        if self.connected == (clip, value):
+            return
+        await self.client.send_message(self.connect_path_for(clip), value, shadow=False)
+        self.connected = (clip, value)
@@ -4,5 +4,6 @@ from .models import Message
 class MessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Message
-        fields = ['id', 'content', 'created_at', 'status']
+        fields = ['id', 'content', 'created_at', 'status', 'is_emergency']
+        read_only_fields = ['is_emergency']
 
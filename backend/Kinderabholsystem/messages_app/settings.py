@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -127,3 +127,62 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Emergency announcements
+
+# Show emergencies without waiting for the button approval on the Raspberry Pi
+EMERGENCY_BYPASS_APPROVAL = config('EMERGENCY_BYPASS_APPROVAL', default=False, cast=bool)
+
+# Maximum time in milliseconds from request to OSC emit before a warning is logged
+EMERGENCY_LATENCY_BUDGET_MS = config('EMERGENCY_LATENCY_BUDGET_MS', default=250, cast=int)
+
+# Resolume target for emergencies, defaults to the regular announcement layer
+EMERGENCY_RESOLUME_IP = config('EMERGENCY_RESOLUME_IP', default='192.168.104.10')
+EMERGENCY_RESOLUME_PORT = config('EMERGENCY_RESOLUME_PORT', default=7000, cast=int)
+EMERGENCY_RESOLUME_LAYER = config('EMERGENCY_RESOLUME_LAYER', default=6, cast=int)
+
+
+# Devices
+
+# Resolume displays as comma separated "ip:port:layer" entries
+DISPLAY_TARGETS = config('DISPLAY_TARGETS', default='192.168.104.10:7000:6', cast=Csv())
+
+# Raspberry Pi Pico approval stations as comma separated base URLs
+APPROVAL_STATIONS = config('APPROVAL_STATIONS', default='http://192.168.104.212/', cast=Csv())
+
+# Maximum number of concurrent HTTP calls to approval stations, OSC sends are not limited
+DEVICE_POOL_SIZE = config('DEVICE_POOL_SIZE', default=8, cast=int)
+
+# How messages are handed to approval stations: "least_loaded" assigns each
+# message to the live station with the fewest unanswered messages, "broadcast"
+# sends every message to every station
+APPROVAL_STRATEGY = config('APPROVAL_STRATEGY', default='least_loaded')
+
+# Seconds between live checks and failed calls before a station's messages are reassigned
+STATION_HEALTH_INTERVAL = config('STATION_HEALTH_INTERVAL', default=10, cast=int)
+STATION_MAX_FAILURES = config('STATION_MAX_FAILURES', default=2, cast=int)
+
+
+# Resolume text layout
+
+# Capacity of one text clip, longer announcements are split into pages
+OSC_CHARS_PER_LINE = config('OSC_CHARS_PER_LINE', default=40, cast=int)
+OSC_LINES_PER_PAGE = config('OSC_LINES_PER_PAGE', default=3, cast=int)
+
+# Text clips available on the layer and seconds each page stays visible
+OSC_CLIP_COUNT = config('OSC_CLIP_COUNT', default=20, cast=int)
+OSC_PAGE_INTERVAL = config('OSC_PAGE_INTERVAL', default=8, cast=int)
+
+# Seconds between full resends of all OSC values to recover from lost UDP packets, 0 disables it
+OSC_RESYNC_INTERVAL = config('OSC_RESYNC_INTERVAL', default=30, cast=int)
+
+
+# Message retention
+
+# Messages older than this many days are moved into the archive by "manage.py archive_messages"
+MESSAGE_RETENTION_DAYS = config('MESSAGE_RETENTION_DAYS', default=30, cast=int)
+
+# Directory for the date-partitioned gzip JSONL archive and rows moved per transaction
+MESSAGE_ARCHIVE_DIR = config('MESSAGE_ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+MESSAGE_ARCHIVE_BATCH_SIZE = config('MESSAGE_ARCHIVE_BATCH_SIZE', default=500, cast=int)
@@ -0,0 +1,363 @@
+import asyncio
+import functools
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import AsyncClient, SimpleTestCase, TestCase
+from django.utils import timezone
+from . import display, export
+from .archive import archive_messages, iter_archived_messages, partition_path
+from .display import DisplayItem, DisplayScheduler, PRIORITY_EMERGENCY, PRIORITY_NORMAL
+from .export import encode, parse_bound
+from .layout import clip_for_page, paginate, wrap_lines
+from .models import Message
+from .osc import OSCTarget, ShadowUDPClient
+
+
+class DisplaySchedulerTests(SimpleTestCase):
+    """Emergency priority lane of the display scheduler"""
+
+    def setUp(self):
+        patcher = mock.patch.object(display, 'send_osc_message', mock.AsyncMock())
+        self.send_osc_message = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.started = []
+        self.queued = []
+        self.finished = []
+
+    def make_scheduler(self) -> DisplayScheduler:
+        async def on_started(pk, display_until):
+            self.started.append(pk)
+
+        async def on_queued(pk):
+            self.queued.append(pk)
+
+        async def on_finished(pk):
+            self.finished.append(pk)
+
+        return DisplayScheduler(on_finished=on_finished, on_started=on_started, on_queued=on_queued)
+
+    @staticmethod
+    def stop(scheduler: DisplayScheduler) -> None:
+        if scheduler._task is not None:
+            scheduler._task.cancel()
+
+    async def test_emergency_preempts_and_requeues_normal(self):
+        scheduler = self.make_scheduler()
+        normal = DisplayItem("Anna", PRIORITY_NORMAL, 60, message_pk=1)
+        emergency = DisplayItem("Notfall", PRIORITY_EMERGENCY, 60, message_pk=2)
+
+        await scheduler.show(normal)
+        await scheduler.show(emergency)
+
+        self.assertIs(scheduler.current, emergency)
+        self.assertEqual(scheduler._pending[0][2], normal)
+        self.assertLessEqual(normal.remaining, 60)
+        self.assertEqual(self.queued, [1])
+        self.assertEqual(self.finished, [])
+        self.assertEqual(len(scheduler.emergency_latencies_ms), 1)
+
+        await scheduler.clear()
+
+        self.assertIs(scheduler.current, normal)
+        self.assertEqual(self.finished, [2])
+        self.assertEqual(self.started, [1, 2, 1])
+        self.stop(scheduler)
+
+    async def test_normal_waits_behind_emergency(self):
+        scheduler = self.make_scheduler()
+        emergency = DisplayItem("Notfall", PRIORITY_EMERGENCY, 60, message_pk=1)
+        normal = DisplayItem("Anna", PRIORITY_NORMAL, 60, message_pk=2)
+
+        await scheduler.show(emergency)
+        await scheduler.show(normal)
+
+        self.assertIs(scheduler.current, emergency)
+        self.assertEqual(scheduler.stats()["pending"], 1)
+        self.assertEqual(self.queued, [2])
+        self.stop(scheduler)
+
+    async def test_normal_replaces_normal(self):
+        scheduler = self.make_scheduler()
+        first = DisplayItem("Anna", PRIORITY_NORMAL, 60, message_pk=1)
+        second = DisplayItem("Ben", PRIORITY_NORMAL, 60, message_pk=2)
+
+        await scheduler.show(first)
+        await scheduler.show(second)
+
+        self.assertIs(scheduler.current, second)
+        self.assertEqual(scheduler._pending, [])
+        self.assertEqual(self.finished, [1])
+        self.stop(scheduler)
+
+    async def test_expired_emergency_resumes_preempted_normal(self):
+        scheduler = self.make_scheduler()
+        normal = DisplayItem("Anna", PRIORITY_NORMAL, 60, message_pk=1)
+        emergency = DisplayItem("Notfall", PRIORITY_EMERGENCY, 0.01, message_pk=2)
+
+        await scheduler.show(normal)
+        await scheduler.show(emergency)
+        await asyncio.sleep(0.1)
+
+        self.assertIs(scheduler.current, normal)
+        self.assertEqual(self.finished, [2])
+        self.send_osc_message.assert_any_await("", "0.0", emergency.targets)
+        self.stop(scheduler)
+
+    async def test_enqueue_does_not_preempt(self):
+        scheduler = self.make_scheduler()
+        first = DisplayItem("Anna", PRIORITY_NORMAL, 60, message_pk=1)
+        second = DisplayItem("Ben", PRIORITY_NORMAL, 60, message_pk=2)
+
+        await scheduler.enqueue(first)
+        await scheduler.enqueue(second)
+
+        self.assertIs(scheduler.current, first)
+        self.assertEqual(scheduler._pending[0][2], second)
+        self.assertEqual(self.finished, [])
+        self.stop(scheduler)
+
+
+class LayoutTests(SimpleTestCase):
+    """Word wrapping and paging of long announcements"""
+
+    def test_wrap_lines_breaks_between_words(self):
+        self.assertEqual(wrap_lines("Die Eltern von Anna", 10), ["Die Eltern", "von Anna"])
+
+    def test_wrap_lines_splits_words_longer_than_a_line(self):
+        self.assertEqual(wrap_lines("ab Abcdefghijkl", 5), ["ab", "Abcde", "fghij", "kl"])
+
+    def test_paginate_groups_lines_into_pages(self):
+        pages = paginate("eins zwei drei vier fuenf", chars_per_line=5, lines_per_page=2)
+        self.assertEqual(pages, ["eins\nzwei", "drei\nvier", "fuenf"])
+
+    def test_paginate_empty_text_has_one_empty_page(self):
+        self.assertEqual(paginate("   "), [""])
+
+    def test_short_text_fits_one_page(self):
+        self.assertEqual(paginate("Die Eltern von Anna M."), ["Die Eltern von Anna M."])
+
+    def test_clip_for_page_cycles_through_the_clips(self):
+        self.assertEqual([clip_for_page(index, clip_count=3) for index in range(5)], [1, 2, 3, 1, 2])
+
+    async def test_scheduler_cycles_pages_across_clips(self):
+        with mock.patch.object(display, 'send_osc_message', mock.AsyncMock()) as send, \
+                mock.patch.object(display, 'PAGE_INTERVAL', 0.01):
+            item = DisplayItem("eins zwei drei vier fuenf sechs " * 10, PRIORITY_NORMAL, 0.05)
+            await DisplayScheduler().show(item)
+            await asyncio.sleep(0.1)
+        self.assertGreater(len(item.pages), 2)
+        clips = [call.kwargs['clip'] for call in send.await_args_list if 'clip' in call.kwargs]
+        self.assertEqual(clips[:3], [1, 2, 3])
+
+
+class FakeTransport:
+    """Datagram transport that records what was sent"""
+
+    def __init__(self):
+        self.datagrams = []
+
+    def sendto(self, data):
+        self.datagrams.append(data)
+
+    def is_closing(self):
+        return False
+
+
+class ShadowUDPClientTests(SimpleTestCase):
+    """Suppression of unchanged OSC updates and periodic resync"""
+
+    def make_client(self, resync_interval: float = 0) -> ShadowUDPClient:
+        client = ShadowUDPClient("127.0.0.1", 7000, resync_interval=resync_interval)
+        self.transport = FakeTransport()
+        client._get_transport = mock.AsyncMock(return_value=self.transport)
+        return client
+
+    async def test_unchanged_value_is_suppressed(self):
+        client = self.make_client()
+        self.assertTrue(await client.send_message("/opacity", 1.0))
+        self.assertFalse(await client.send_message("/opacity", 1.0))
+        self.assertTrue(await client.send_message("/opacity", 0.0))
+        self.assertEqual(client.stats(), {"sent": 2, "suppressed": 1, "resynced": 0})
+        self.assertEqual(len(self.transport.datagrams), 2)
+
+    async def test_force_and_changed_type_are_sent(self):
+        client = self.make_client()
+        await client.send_message("/connect", 1)
+        self.assertTrue(await client.send_message("/connect", 1.0))
+        self.assertTrue(await client.send_message("/connect", 1.0, force=True))
+        self.assertEqual(client.suppressed, 0)
+
+    async def test_unshadowed_trigger_is_always_sent_and_not_remembered(self):
+        client = self.make_client()
+        self.assertTrue(await client.send_message("/connect", 1, shadow=False))
+        self.assertTrue(await client.send_message("/connect", 1, shadow=False))
+        self.assertNotIn("/connect", client.shadow)
+
+    async def test_resync_resends_shadowed_values_only(self):
+        client = self.make_client(resync_interval=0.01)
+        await client.send_message("/text", "Anna")
+        await client.send_message("/connect", 1, shadow=False)
+        await asyncio.sleep(0.035)
+        client._resync_task.cancel()
+        self.assertGreaterEqual(client.resynced, 2)
+        self.assertEqual(len(self.transport.datagrams), 2 + client.resynced)
+        self.assertEqual(set(self.transport.datagrams[2:]), {self.transport.datagrams[0]})
+
+    async def test_target_connects_clip_only_when_it_changes(self):
+        target = OSCTarget("127.0.0.1", 7000, layer=6)
+        target.client = self.make_client()
+        await target.show(1, "Anna", 1.0)
+        await target.show(1, "Anna", 1.0)
+        self.assertEqual(len(self.transport.datagrams), 3)
+        await target.show(2, "Ben", 1.0)
+        self.assertEqual(target.connected, (2, 1))
+        self.assertEqual(len(self.transport.datagrams), 5)
+
+
+def create_message(content: str, created_at: datetime, **fields) -> Message:
+    """Create a message with a fixed creation time, created_at is set on insert otherwise"""
+    message = Message.objects.create(content=content, **fields)
+    Message.objects.filter(pk=message.pk).update(created_at=created_at)
+    message.created_at = created_at
+    return message
+
+
+class ArchiveTests(TestCase):
+    """Archival into date-partitioned gzip JSONL files"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive_dir = Path(directory.name)
+        self.now = timezone.now()
+
+    def test_moves_old_messages_in_batches(self):
+        old = [create_message(f"Kind {i}", self.now - timedelta(days=40, hours=i)) for i in range(5)]
+        recent = create_message("Neu", self.now - timedelta(days=1))
+
+        moved, _ = archive_messages(timedelta(days=30), self.archive_dir, batch_size=2)
+
+        self.assertEqual(moved, 5)
+        self.assertEqual(list(Message.objects.values_list('pk', flat=True)), [recent.pk])
+        archived = list(iter_archived_messages(archive_dir=self.archive_dir))
+        self.assertEqual(sorted(row['id'] for row in archived), [message.pk for message in old])
+        self.assertIsNotNone(archived[0]['created_at'].tzinfo)
+
+    def test_partitions_by_day_of_creation(self):
+        first = datetime(2025, 1, 10, 23, 30, tzinfo=dt_timezone.utc)
+        create_message("Anna", first)
+        create_message("Ben", first + timedelta(hours=1))
+
+        archive_messages(timedelta(days=30), self.archive_dir)
+
+        self.assertTrue(partition_path(self.archive_dir, first.date()).exists())
+        self.assertTrue(partition_path(self.archive_dir, (first + timedelta(hours=1)).date()).exists())
+
+    def test_iter_archived_messages_filters_range(self):
+        day = datetime(2025, 1, 10, tzinfo=dt_timezone.utc)
+        for i in range(4):
+            create_message(f"Kind {i}", day + timedelta(days=i, hours=12))
+        archive_messages(timedelta(days=30), self.archive_dir)
+
+        rows = list(iter_archived_messages(day + timedelta(days=1), day + timedelta(days=3), self.archive_dir))
+
+        self.assertEqual([row['content'] for row in rows], ["Kind 1", "Kind 2"])
+
+    def test_archiving_again_appends_to_the_partition(self):
+        day = datetime(2025, 1, 10, 12, tzinfo=dt_timezone.utc)
+        create_message("Anna", day)
+        archive_messages(timedelta(days=30), self.archive_dir)
+        create_message("Ben", day + timedelta(hours=1))
+        archive_messages(timedelta(days=30), self.archive_dir)
+
+        rows = list(iter_archived_messages(archive_dir=self.archive_dir))
+
+        self.assertEqual([row['content'] for row in rows], ["Anna", "Ben"])
+
+
+class ParseBoundTests(SimpleTestCase):
+    """Export range bounds from query parameters and command options"""
+
+    def test_date_means_midnight_utc(self):
+        self.assertEqual(parse_bound("2025-02-01"), datetime(2025, 2, 1, tzinfo=dt_timezone.utc))
+
+    def test_naive_datetime_is_utc(self):
+        self.assertEqual(parse_bound("2025-02-01T10:30"), datetime(2025, 2, 1, 10, 30, tzinfo=dt_timezone.utc))
+
+    def test_aware_datetime_keeps_its_offset(self):
+        self.assertEqual(parse_bound("2025-02-01T10:30+01:00"),
+                         datetime(2025, 2, 1, 9, 30, tzinfo=dt_timezone.utc))
+
+    def test_empty_value_is_no_bound(self):
+        self.assertIsNone(parse_bound(""))
+        self.assertIsNone(parse_bound(None))
+
+    def test_invalid_value_raises(self):
+        with self.assertRaises(ValueError):
+            parse_bound("gestern")
+
+
+class ExportTests(TestCase):
+    """Streaming CSV and JSONL export of the message history"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive_dir = Path(directory.name)
+        patcher = mock.patch.object(export, 'iter_archived_messages',
+                                    functools.partial(iter_archived_messages, archive_dir=self.archive_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.day = datetime(2025, 1, 10, 12, tzinfo=dt_timezone.utc)
+        create_message("Anna", self.day)
+        archive_messages(timedelta(days=30), self.archive_dir)
+        create_message("Ben, Jr.", self.day + timedelta(days=1))
+        create_message("Notfall", timezone.now(), is_emergency=True)
+        self.staff = User.objects.create_user("staff", password="secret", is_staff=True)
+
+    def test_encode_csv_quotes_fields(self):
+        rows = [{'id': 1, 'content': "Ben, Jr.", 'created_at': self.day, 'status': "sent", 'is_emergency': False}]
+        text = "".join(encode(rows, 'csv'))
+        self.assertEqual(text.splitlines(), [
+            "id,content,created_at,status,is_emergency",
+            '1,"Ben, Jr.",2025-01-10T12:00:00+00:00,sent,False',
+        ])
+
+    def test_encode_jsonl_writes_one_object_per_line(self):
+        rows = [{'id': i, 'content': "Anna", 'created_at': self.day, 'status': "sent", 'is_emergency': False}
+                for i in range(3)]
+        lines = "".join(encode(rows, 'jsonl')).splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [0, 1, 2])
+
+    async def get(self, path: str, login: bool = True):
+        client = AsyncClient()
+        if login:
+            await client.aforce_login(self.staff)
+        return await client.get(path)
+
+    async def test_export_streams_archive_before_live_rows(self):
+        response = await self.get('/api/messages/export/?output=jsonl')
+        self.assertEqual(response.status_code, 200)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual([json.loads(line)['content'] for line in body.splitlines()],
+                         ["Anna", "Ben, Jr.", "Notfall"])
+
+    async def test_export_filters_range_and_skips_archive(self):
+        response = await self.get('/api/messages/export/?since=2025-01-01&until=2025-02-01&archive=0')
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        lines = body.splitlines()
+        self.assertEqual(lines[0], "id,content,created_at,status,is_emergency")
+        self.assertEqual(len(lines), 2)
+        self.assertIn('"Ben, Jr."', lines[1])
+
+    async def test_export_rejects_invalid_parameters(self):
+        self.assertEqual((await self.get('/api/messages/export/?output=xml')).status_code, 400)
+        self.assertEqual((await self.get('/api/messages/export/?since=gestern')).status_code, 400)
+
+    async def test_export_requires_staff(self):
+        self.assertEqual((await self.get('/api/messages/export/', login=False)).status_code, 403)
@@ -1,11 +1,13 @@
 from django.urls import path
-from .views import MessageListCreateAPIView, MessageStatusUpdateAPIView, ClearLayerAPIView, RaspberryLiveAPIView, EmergencyAPIView
+from .views import MessageListCreateAPIView, MessageStatusUpdateAPIView, ClearLayerAPIView, RaspberryLiveAPIView, EmergencyAPIView, DisplayStatusAPIView, MessageExportAPIView
 
 urlpatterns = [
     path('messages/', MessageListCreateAPIView.as_view(), name='message_list_create'),
+    path('messages/export/', MessageExportAPIView.as_view(), name='message_export'),
     path('messages/<int:pk>/', MessageStatusUpdateAPIView.as_view(), name='message_status_update'),
     path('clear/', ClearLayerAPIView.as_view(), name='clear_layer'),
     path('live/', RaspberryLiveAPIView.as_view(), name='live'),
     path('emergency/', EmergencyAPIView.as_view(), name='emergency'),
+    path('display/', DisplayStatusAPIView.as_view(), name='display_status'),
 ]
 
@@ -1,252 +1,378 @@
 """
 Django View Module for Message Management with OSC Integration and Raspberry Pi Communication
+
+All views are asynchronous and meant to be served by an ASGI server, so slow
+Raspberry Pi round trips and display timers do not occupy a worker thread.
 """
 
-import threading
 import time
-from rest_framework.views import APIView
+from datetime import timedelta
+from adrf.views import APIView
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Message
 from .serializers import MessageSerializer
-from pythonosc.udp_client import SimpleUDPClient
-import requests
+from .devices import registry, spawn
+from .export import EXPORT_FORMATS, aencode, aiter_rows, parse_bound
+from .display import (
+    DisplayItem, DisplayScheduler, DISPLAY_DURATION, PRIORITY_EMERGENCY, PRIORITY_NORMAL, send_osc_message,
+)
 import logging
 
-# OSC Configuration for Resolume Arena
-RESOLUME_IP = "192.168.104.10"  # Resolume software IP address
-RESOLUME_PORT = 7000            # Default OSC port in Resolume
-client = SimpleUDPClient(RESOLUME_IP, RESOLUME_PORT)
-
-# Resolume OSC parameter paths
-PARAM_PATH_OPACITY = "/composition/layers/6/video/opacity"
-PARAM_PATH = "/composition/layers/6/clips/1/video/effects/textblock/effect/text/params/lines"
-PARAM_PATH_CONNECT = "/composition/layers/6/clips/1/connect"
-
-# Global thread controller for message display management
-active_thread = None
-stop_event = threading.Event()
-clear_requested = False  # Flag for manual clear operations
-number = 0
+# Show emergencies without waiting for the button approval on the Raspberry Pi
+EMERGENCY_BYPASS_APPROVAL = getattr(settings, 'EMERGENCY_BYPASS_APPROVAL', False)
+
+# Statuses in which a message still waits for a decision on an approval station
+UNDECIDED_STATUSES = ["sent", "received"]
+
+# Queued announcements older than this are not shown anymore after a restart
+RECOVER_QUEUED_MAX_AGE = timedelta(hours=1)
+
 logger = logging.getLogger(__name__)
 
-def send_osc_message(message: str, opacity: float) -> None:
-    """
-    Send OSC message to Resolume Arena to control text display.
-    
-    Args:
-        message (str): Text content to display
-        opacity (float): Layer opacity (0.0-1.0)
-        
-    Sends message to all 20 text clips in layer 4 and controls layer opacity.
-    """
-    try:
-        opacity = float(opacity)
-        client.send_message(PARAM_PATH, message)
-        client.send_message(PARAM_PATH_OPACITY, opacity)
-        connect = int(opacity)
-        client.send_message(PARAM_PATH_CONNECT, connect)
-        print(f"Sent OSC message: {message}")
-    except Exception as e:
-        print(f"OSC communication error: {e}")
-
-
-def delayed_send_osc_message(message: str, delay: int = 120, message_pk: int = None) -> None:
+
+async def delayed_send_osc_message(message: str, delay: int = DISPLAY_DURATION, message_pk: int = None,
+                                   emergency: bool = False, requested_at: float = None,
+                                   queued: bool = False) -> DisplayItem:
     """
-    Manage delayed message clearing with thread control.
-    
+    Queue a message for display and clear it after the delay.
+
     Args:
         message (str): Content to display
         delay (int): Display duration in seconds
         message_pk (int): Primary key of Message object
-        
-    Immediately shows message, then clears it after delay unless interrupted.
+        emergency (bool): Use the emergency priority lane
+        requested_at (float): time.monotonic() of the request for latency measurement
+        queued (bool): Wait behind the current announcement instead of replacing it
+
+    Returns:
+        DisplayItem: The scheduled announcement
+
+    Emergencies are shown verbatim and preempt any normal announcement.
     """
-    global active_thread, stop_event, number
-    
-    # Stop any existing message thread
-    if active_thread and active_thread.is_alive():
-        stop_event.set()
-        active_thread.join()
-        stop_event.clear()
-
-    # Show initial message
-    if "Medizinischer Notfall:" in message:
+    if emergency:
         logger.debug(message)
-        send_osc_message(message, "1.0")
+        item = DisplayItem(message, PRIORITY_EMERGENCY, delay, message_pk, requested_at)
+    else:
+        item = DisplayItem(f"Die Eltern von {message} bitte zum Check-in kommen",
+                           PRIORITY_NORMAL, delay, message_pk, requested_at)
+    if queued:
+        await display_scheduler.enqueue(item)
     else:
-        send_osc_message(f"Die Eltern von {message} bitte zum Check-in kommen", "1.0")
-    number = message_pk
-
-    def send_after_delay():
-        """Thread target function for delayed operations"""
-        start = time.time()
-        while (time.time() - start) < delay:
-            if stop_event.is_set():
-                print("Message display interrupted by new message")
-                return
-            time.sleep(0.1)  # Allow for interrupt checks
-            
-        # Clear message after delay
-        send_osc_message("", "0.0")
-        
-        # Update message status if PK provided
-        if message_pk:
-            update_state(message_pk, "displayed")
-            print(f"Updated message {message_pk} to 'displayed' status")
-
-    # Start new display thread
-    active_thread = threading.Thread(target=send_after_delay)
-    active_thread.start()
-
-
-def send_message_to_raspberry_pi(content: str, pk: int) -> None:
+        await display_scheduler.show(item)
+    return item
+
+
+async def send_message_to_raspberry_pi(content: str, pk: int) -> bool:
     """
-    Forward messages to Raspberry Pi endpoint.
-    
+    Forward messages to all Raspberry Pi approval stations concurrently.
+
     Args:
         content (str): Message text content
         pk (int): Primary key of Message object
+
+    Returns:
+        bool: True if a station accepted the message, False if it stays "sent"
+            and is offered to the stations again by the registry's live check
     """
-    RASPBERRY_PI_URL = "http://192.168.104.212/"
-    
-    try:
-        response = requests.post(
-            RASPBERRY_PI_URL,
-            json={"id": pk, "message": content}
-        )
-        
-        if response.status_code == 200:
-            print("Message successfully forwarded to Raspberry Pi")
-            update_state(pk, "received")
-        else:
-            print(f"RPi communication error: {response.status_code}")
-    except Exception as e:
-        print(f"RPi connection failed: {e}")
+    accepted = await registry.forward_message(content, pk)
+    if not accepted:
+        print(f"No Raspberry Pi accepted message {pk}, retrying in the background")
+        return False
+    print(f"Message successfully forwarded to {len(accepted)} Raspberry Pi(s)")
+    await mark_received(pk)
+    return True
+
 
+async def mark_received(pk: int) -> None:
+    """Mark a message as received once an approval station accepted it"""
+    await Message.objects.filter(pk=pk, status="sent").aupdate(status="received")
 
-def update_state(pk: int, new_status: str) -> bool:
+
+async def decide_message(pk: int, new_status: str, decided_by: str = None) -> bool:
     """
-    Update message status and trigger OSC communication when approved.
-    
+    Apply the first approval or rejection for a message.
+
     Args:
         pk (int): Primary key of Message object
-        new_status (str): New status value
-        
+        new_status (str): "approved" or "rejected"
+        decided_by (str): IP address of the deciding station
+
     Returns:
-        bool: True if update successful, False otherwise
-        
-    Triggers OSC display when status changes to 'approved'
+        bool: True if this decision won, False if the message was already decided or does not exist
+
+    The status is changed with a single conditional UPDATE, so of several
+    stations pressing at the same time exactly one wins. The message is then
+    withdrawn from the other stations in the background.
     """
-    try:
-        message = Message.objects.get(pk=pk)
-        message.status = new_status
-        logger.debug(message.content)
-        
-        if new_status == "approved":
-            delayed_send_osc_message(
-                message.content,
-                delay=120,
-                message_pk=pk
-            )
-            
-        message.save()
-        return True
-    except Message.DoesNotExist:
+    won = await Message.objects.filter(pk=pk, status__in=UNDECIDED_STATUSES).aupdate(status=new_status)
+    if not won:
         return False
 
+    if new_status == "approved":
+        message = await Message.objects.aget(pk=pk)
+        await delayed_send_osc_message(
+            message.content,
+            delay=DISPLAY_DURATION,
+            message_pk=pk,
+            emergency=message.is_emergency
+        )
+    spawn(registry.withdraw_message(pk, decided_by))
+    return True
+
+
+async def update_state(pk: int, new_status: str) -> bool:
+    """
+    Update the status of a message outside of an approval decision.
+
+    Args:
+        pk (int): Primary key of Message object
+        new_status (str): "received" or "displayed"
+
+    Returns:
+        bool: True if update successful, False if the message does not exist
+
+    Only the status and the clear deadline are written, so a message marked
+    displayed is not resumed by recover_display after a restart, and a
+    deadline written concurrently by start_display is not overwritten with
+    a stale row.
+    """
+    updated = await Message.objects.filter(pk=pk).aupdate(status=new_status, display_until=None)
+    return updated > 0
+
+
+async def start_display(pk: int, display_until) -> None:
+    """Persist the clear deadline of a message that went on screen"""
+    await Message.objects.filter(pk=pk).aupdate(display_until=display_until)
+
+
+async def queue_display(pk: int) -> None:
+    """Drop the clear deadline of an approved message that waits in the display queue"""
+    await Message.objects.filter(pk=pk, display_until__isnull=False).aupdate(display_until=None)
+
+
+async def finish_display(pk: int) -> None:
+    """Mark a message as displayed once it left the screen and drop its deadline"""
+    await Message.objects.filter(pk=pk).aupdate(status="displayed", display_until=None)
+
+
+async def recover_display() -> None:
+    """
+    Restore the display state after a restart.
+
+    Messages whose clear deadline passed while the backend was down are
+    cleared from Resolume and marked displayed immediately. Messages that
+    still have time left are shown again for the rest of their duration.
+    Approved messages without a deadline were waiting in the display queue,
+    they are queued again behind them for their full duration unless they
+    are older than RECOVER_QUEUED_MAX_AGE, then they are marked displayed.
+    """
+    now = timezone.now()
+    overdue = []
+    resumed = []
+    async for message in Message.objects.filter(display_until__isnull=False).order_by('-is_emergency', 'display_until'):
+        remaining = (message.display_until - now).total_seconds()
+        if remaining <= 0:
+            overdue.append(message)
+            continue
+        print(f"Resuming display of message {message.id} for {remaining:.0f}s")
+        resumed.append(message.id)
+        await delayed_send_osc_message(message.content, remaining, message.id, message.is_emergency)
+
+    # Resumed messages that had to wait behind a resumed emergency lost their deadline already
+    stale = []
+    queued = Message.objects.filter(status="approved", display_until__isnull=True).exclude(pk__in=resumed) \
+        .order_by('-is_emergency', 'created_at')
+    async for message in queued:
+        if message.created_at < now - RECOVER_QUEUED_MAX_AGE:
+            stale.append(message.id)
+            continue
+        print(f"Queueing message {message.id} again")
+        await delayed_send_osc_message(message.content, message_pk=message.id,
+                                       emergency=message.is_emergency, queued=True)
+    if stale:
+        print(f"Dropping {len(stale)} queued messages older than {RECOVER_QUEUED_MAX_AGE}")
+        await Message.objects.filter(pk__in=stale).aupdate(status="displayed")
+
+    current = display_scheduler.current
+    cleared = []
+    for message in overdue:
+        targets = registry.emergency_displays if message.is_emergency else registry.displays
+        if targets not in cleared and (current is None or current.targets is not targets):
+            await send_osc_message("", "0.0", targets)
+            cleared.append(targets)
+    for message in overdue:
+        print(f"Clearing overdue message {message.id}")
+        await finish_display(message.id)
+
+
+# Persists display deadlines and marks announcements as displayed once they leave the screen
+display_scheduler = DisplayScheduler(on_finished=finish_display, on_started=start_display, on_queued=queue_display)
+
+# Messages that no station accepted at first are marked received once a retry places them
+registry.on_assigned = mark_received
+
+
+def forward_failed_response(data: dict) -> Response:
+    """503 for a stored message that no approval station accepted yet"""
+    return Response(
+        {'error': 'No approval station accepted the message, it is retried in the background', 'message': data},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
 
 class MessageListCreateAPIView(APIView):
     """API endpoint for message creation and retrieval"""
-    
-    def get(self, request) -> Response:
+
+    async def get(self, request) -> Response:
         """Retrieve last 5 messages ordered by creation time"""
-        messages = Message.objects.all().order_by('-created_at')[:5]
+        messages = [message async for message in Message.objects.all().order_by('-created_at')[:5]]
         serializer = MessageSerializer(messages, many=True)
         return Response(serializer.data)
 
-    def post(self, request) -> Response:
+    async def post(self, request) -> Response:
         """Create new message and forward to Raspberry Pi"""
         serializer = MessageSerializer(data=request.data)
         if serializer.is_valid():
-            message = serializer.save()
-            send_message_to_raspberry_pi(serializer.data['content'], message.id)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            message = await Message.objects.acreate(**serializer.validated_data)
+            data = MessageSerializer(message).data
+            if not await send_message_to_raspberry_pi(message.content, message.id):
+                return forward_failed_response(data)
+            return Response(data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class MessageStatusUpdateAPIView(APIView):
     """API endpoint for message status updates"""
-    
-    def patch(self, request, pk: int) -> Response:
+
+    async def patch(self, request, pk: int) -> Response:
         """Partial update of message status"""
         try:
             new_status = request.data.get('status')
-            
+
             if new_status not in ["received", "approved", "displayed", "rejected"]:
                 return Response(
-                    {'error': 'Invalid status value'}, 
+                    {'error': 'Invalid status value'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-                
-            update_state(pk, new_status)
-            message = Message.objects.get(pk=pk)
+
+            if new_status in ["approved", "rejected"]:
+                client_ip = request.META.get('HTTP_X_REAL_IP') or request.META.get('REMOTE_ADDR')
+                won = await decide_message(pk, new_status, client_ip)
+                message = await Message.objects.aget(pk=pk)
+                if not won:
+                    return Response(MessageSerializer(message).data, status=status.HTTP_409_CONFLICT)
+                return Response(MessageSerializer(message).data)
+
+            await update_state(pk, new_status)
+            message = await Message.objects.aget(pk=pk)
             return Response(MessageSerializer(message).data)
-            
+
         except Message.DoesNotExist:
             return Response(
-                {'error': 'Message not found'}, 
+                {'error': 'Message not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
 
 class ClearLayerAPIView(APIView):
     """API endpoint for immediate display clearing"""
-    
-    def post(self, request) -> Response:
-        """Clear current display and stop active threads"""
-        global active_thread, stop_event, clear_requested, number
-        
-        if active_thread and active_thread.is_alive():
-            update_state(number, "displayed")
-            clear_requested = True
-            stop_event.set()
-            active_thread.join()
-            stop_event.clear()
-            
-        send_osc_message("", "0.0")
+
+    async def post(self, request) -> Response:
+        """Clear current display, pending announcements resume afterwards"""
+        await display_scheduler.clear()
         return Response({'status': 'Display cleared successfully'})
 
 class RaspberryLiveAPIView(APIView):
-    """API endpoint to check if Raspberry Pi is running"""
+    """API endpoint to check if the Raspberry Pis are running"""
+
+    async def get(self, request) -> Response:
+        """Check the run state of all Raspberry Pi approval stations, OK if any answered this check"""
+        stations = await registry.check_stations()
+        if any(station['reachable'] for station in stations.values()):
+            return Response({"status": "OK", "code": 200, "stations": stations}, status=status.HTTP_200_OK)
+        return Response(
+            {"status": "Unreachable", "code": 503, "stations": stations},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+class DisplayStatusAPIView(APIView):
+    """API endpoint for the display state and OSC counters"""
+
+    async def get(self, request) -> Response:
+        """Current announcement, queue length, emergency latencies and sent/suppressed OSC updates"""
+        return Response(display_scheduler.stats())
+
+class MessageExportAPIView(APIView):
+    """API endpoint for streaming the message history as CSV or JSONL, staff only"""
 
-    def get(self, request) -> Response:
-        """Check the run state of Raspberry Pi"""
-        RASPBERRY_PI_URL = "http://192.168.104.212/live"
+    # The history includes the archive, so it is not public like the last 5 messages
+    permission_classes = [IsAdminUser]
 
+    async def get(self, request):
+        """
+        Stream messages with timestamps, oldest first.
+
+        Query parameters: output (csv or jsonl), since and until (ISO date or
+        datetime) and archive (0 to skip archived messages). Rows are fetched
+        and encoded in chunks, so the response starts immediately and memory
+        use does not grow with the range.
+        """
+        output_format = request.query_params.get('output', 'csv')
+        if output_format not in EXPORT_FORMATS:
+            return Response({'error': f'Invalid output format: {output_format}'},
+                            status=status.HTTP_400_BAD_REQUEST)
         try:
-            response = requests.get(RASPBERRY_PI_URL, timeout=5)
-            if response.status_code == 200:
-                return Response({"status": "OK", "code": 200}, status=status.HTTP_200_OK)
-            else:
-                return Response(
-                    {"status": "Service Unavailable", "code": 503},
-                    status=status.HTTP_503_SERVICE_UNAVAILABLE
-                )
-        except requests.RequestException:
-            return Response(
-                {"status": "Unreachable", "code": 503},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE
-            )
+            since = parse_bound(request.query_params.get('since'))
+            until = parse_bound(request.query_params.get('until'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        include_archive = request.query_params.get('archive', '1') != '0'
+
+        response = StreamingHttpResponse(
+            aencode(aiter_rows(since, until, include_archive), output_format),
+            content_type=EXPORT_FORMATS[output_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="messages.{output_format}"'
+        return response
 
 class EmergencyAPIView(APIView):
     """API endpoint for emergency message creation"""
-    
-    def post(self, request) -> Response:
-        """Create new emergency message and forward to Raspberry Pi"""
+
+    async def post(self, request) -> Response:
+        """
+        Create new emergency message.
+
+        With EMERGENCY_BYPASS_APPROVAL the message is stored and displayed
+        right away, so the time to OSC emit does not include any Raspberry Pi
+        round trip. Otherwise it is forwarded for approval.
+        """
+        requested_at = time.monotonic()
         serializer = MessageSerializer(data=request.data)
-        if serializer.is_valid():
-            message = serializer.save()
-            send_message_to_raspberry_pi(serializer.data['content'], message.id)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        if EMERGENCY_BYPASS_APPROVAL:
+            # The row exists before the item is scheduled, so finish_display can
+            # mark it displayed even if the item is cleared or expires right away
+            message = await Message.objects.acreate(
+                **serializer.validated_data, is_emergency=True, status="approved",
+                display_until=timezone.now() + timedelta(seconds=DISPLAY_DURATION)
+            )
+            await delayed_send_osc_message(
+                message.content,
+                message_pk=message.id,
+                emergency=True,
+                requested_at=requested_at
+            )
+            return Response(MessageSerializer(message).data, status=status.HTTP_201_CREATED)
+
+        message = await Message.objects.acreate(**serializer.validated_data, is_emergency=True)
+        data = MessageSerializer(message).data
+        if not await send_message_to_raspberry_pi(message.content, message.id):
+            return forward_failed_response(data)
+        return Response(data, status=status.HTTP_201_CREATED)
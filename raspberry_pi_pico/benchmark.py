@@ -0,0 +1,80 @@
+# Copyright (c) 2025 Simon Klenk
+# This software is licensed under the MIT License.
+# See the LICENSE file in the project directory for the full license text.
+
+"""
+On-device benchmark of the OLED pipeline.
+
+Run it on the Pico instead of main.py (e.g. "import benchmark" in the REPL).
+For every rotation it scrolls a long text through the streaming scroll
+window as fast as possible and reports frames per second,
+once with the viper kernels and once with the pure-Python fallback.
+"""
+
+import time
+import sh1106
+import display
+from display import Display, GLYPH_WIDTH
+
+FRAMES = 100
+TEXT = "Die Eltern von Maximilian Mustermann bitte  "
+
+native_scale_glyph = display.scale_glyph
+
+
+def benchmark_rotation(rotate, native, frames=FRAMES):
+    """
+    Scrolls TEXT on a display with the given rotation.
+
+    Args:
+        rotate (int): Display rotation (0, 90, 180 or 270).
+        native (bool): Use the viper kernels if available.
+        frames (int, optional): Number of frames to render. Defaults to 100.
+
+    Returns:
+        tuple: (frames per second, milliseconds to set up and show the first frame of TEXT)
+    """
+    used_native = sh1106.use_native(native)
+    display.scale_glyph = native_scale_glyph if used_native else None
+    oled = Display(show_text=False, new_text=False, text="", rotate=rotate, wrap=False)
+
+    # Drive the scroll window directly: the render loop paces frames in real time
+    oled.load_scroll_text(TEXT)
+    device = oled.display
+    device.poweron()
+    started = time.ticks_us()
+    device.blit(oled.window_fb, oled.scroll_window(0), 0)
+    device.show()
+    render_ms = time.ticks_diff(time.ticks_us(), started) / 1000
+
+    scroll = len(TEXT) * GLYPH_WIDTH - oled.width
+    started = time.ticks_us()
+    for frame in range(frames):
+        device.blit(oled.window_fb, oled.scroll_window(frame * 2 % scroll), 0)
+        device.show()
+    elapsed_us = time.ticks_diff(time.ticks_us(), started)
+    device.fill(0)
+    device.show()
+    device.poweroff()
+    return frames * 1000000 / elapsed_us, render_ms
+
+
+def run():
+    """Prints frames per second and render time for every rotation and kernel set."""
+    try:
+        import kernels
+        modes = (True, False)
+    except Exception:
+        print("Viper kernels not available, measuring the Python fallback only")
+        modes = (False,)
+
+    for native in modes:
+        for rotate in (0, 90, 180, 270):
+            fps, render_ms = benchmark_rotation(rotate, native)
+            print("{:6} rotate={:3}: {:6.1f} fps, render {:6.1f} ms".format(
+                "viper" if native else "python", rotate, fps, render_ms))
+    sh1106.use_native(True)
+    display.scale_glyph = native_scale_glyph
+
+
+run()
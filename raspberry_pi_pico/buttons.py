@@ -0,0 +1,65 @@
+# Copyright (c) 2025 Simon Klenk
+# This software is licensed under the MIT License.
+# See the LICENSE file in the project directory for the full license text.
+
+import machine
+import time
+
+DEBOUNCE_MS = 30  # Time the pin must be stable before a rising edge counts as a press
+
+
+class Button:
+    """
+    Push button that reports presses from its pin interrupt.
+
+    Both edges are watched. A rising edge only counts as a press if the pin
+    was stable for debounce_ms before it, so contact bounce on press and on
+    release is ignored. Accepted presses set a shared ThreadSafeFlag, which
+    wakes the waiting task without any polling.
+
+    Attributes:
+        pressed_at (int): time.ticks_us() of the last accepted press.
+        presses (int): Number of accepted presses.
+    """
+    def __init__(self, pin, flag, debounce_ms=DEBOUNCE_MS):
+        """
+        Initializes the pin and its interrupt handler.
+
+        Args:
+            pin (int): GPIO number, the button pulls the pin high when pressed.
+            flag (ThreadSafeFlag): Flag set on every accepted press.
+            debounce_ms (int, optional): Debounce time in milliseconds. Defaults to 30.
+        """
+        self.flag = flag
+        self.debounce_ms = debounce_ms
+        self.pressed_at = 0
+        self.presses = 0
+        self._pending = False
+        self._edge_at = time.ticks_ms()
+        self.pin = machine.Pin(pin, machine.Pin.IN, machine.Pin.PULL_DOWN)
+        self.pin.irq(self._irq, machine.Pin.IRQ_RISING | machine.Pin.IRQ_FALLING)
+
+    def _irq(self, pin):
+        now = time.ticks_ms()
+        stable = time.ticks_diff(now, self._edge_at) >= self.debounce_ms
+        self._edge_at = now
+        if stable and pin.irq().flags() & machine.Pin.IRQ_RISING:
+            self.pressed_at = time.ticks_us()
+            self.presses += 1
+            self._pending = True
+            self.flag.set()
+
+    def take(self):
+        """
+        Consumes a pending press.
+
+        Returns:
+            bool: True once for every press since the last call.
+        """
+        pending = self._pending
+        self._pending = False
+        return pending
+
+    def latency_us(self):
+        """Returns the microseconds since the last accepted press."""
+        return time.ticks_diff(time.ticks_us(), self.pressed_at)
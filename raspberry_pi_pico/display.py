@@ -3,9 +3,105 @@
 # See the LICENSE file in the project directory for the full license text.
 
 from machine import Pin, I2C
+import gc
 import time
 import framebuf
 import uasyncio
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+FONT_SIZE = 8                           # Built-in framebuf font is 8x8 pixels
+GLYPH_WIDTH = 18                        # Scaled character width (8 px * 2.25)
+GLYPH_HEIGHT = 64                       # Scaled character height (8 px * 8)
+GLYPH_PAGES = GLYPH_HEIGHT // 8         # Display pages (8 pixel rows each) per glyph
+# Font column shown in each glyph column (nearest neighbour)
+GLYPH_COLUMNS = bytes(x * FONT_SIZE // GLYPH_WIDTH for x in range(GLYPH_WIDTH))
+
+try:
+    from kernels import scale_glyph, shift_left
+except Exception:
+    scale_glyph = None
+    shift_left = None
+
+GLYPH_SIZE = GLYPH_PAGES * GLYPH_WIDTH   # Bytes per scaled glyph
+# Characters left by sanitize_text plus "/" of the queue position, their glyphs are built at boot
+GLYPH_CHARSET = " abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.,?!-/"
+
+# Longest text rendered as a whole into an arena slot: texts that fit the
+# display without scrolling, padded to one block of 8 characters. Longer
+# texts are word-wrapped or streamed through the scroll window.
+STATIC_TEXT_LENGTH = 8
+ARENA_SLOTS = 3                         # Rendered texts kept for re-display
+
+IDLE_POLL_MS = 50                       # Mailbox check interval while nothing moves on screen
+SCROLL_SPEED = 100                      # Default scroll speed in pixels per second
+SCROLL_PAUSE_MS = 800                   # Pause at the start of every scroll pass
+FRAME_INTERVAL_MS = 20                  # Target time between two scroll frames
+# Upper bounds in milliseconds of the frame-time histogram buckets, the last bucket takes the rest
+FRAME_BUCKETS_MS = (2, 5, 10, 20, 30, 50, 100)
+
+# Word-wrapped layouts tried for texts too wide for one line, largest first:
+# (horizontal scale, vertical scale, maximum number of lines)
+WRAP_LAYOUTS = ((2, 4, 2), (1, 3, 2), (1, 2, 3))
+
+def record_frame_time(histogram, us):
+    """Counts a frame time in microseconds into the FRAME_BUCKETS_MS histogram."""
+    ms = us // 1000
+    i = 0
+    while i < len(FRAME_BUCKETS_MS) and ms >= FRAME_BUCKETS_MS[i]:
+        i += 1
+    histogram[i] += 1
+
+def wrap_words(text, columns, rows):
+    """
+    Word-wraps a text onto lines of at most columns characters.
+
+    Args:
+        text (str): The text to wrap.
+        columns (int): Characters per line.
+        rows (int): Maximum number of lines.
+
+    Returns:
+        list: The lines, or None if a word is longer than a line or more than rows lines are needed.
+    """
+    lines = []
+    line = ""
+    for word in text.split():
+        if len(word) > columns:
+            return None
+        if not line:
+            line = word
+        elif len(line) + 1 + len(word) <= columns:
+            line += " " + word
+        else:
+            if len(lines) + 1 >= rows:
+                return None
+            lines.append(line)
+            line = word
+    if line:
+        lines.append(line)
+    return lines
+
+def wrap_layout(text, width=128, height=64):
+    """
+    Chooses the largest layout of WRAP_LAYOUTS the text fits into.
+
+    Args:
+        text (str): The text to lay out.
+        width (int, optional): Display width in pixels. Defaults to 128.
+        height (int, optional): Display height in pixels. Defaults to 64.
+
+    Returns:
+        tuple: (horizontal scale, vertical scale, lines), or None if the text does not fit any layout.
+    """
+    for scale_x, scale_y, rows in WRAP_LAYOUTS:
+        rows = min(rows, height // (FONT_SIZE * scale_y))
+        lines = wrap_words(text, width // (FONT_SIZE * scale_x), rows)
+        if lines:
+            return scale_x, scale_y, lines
+    return None
 
 class DisplayInitializationError(Exception):
     """Custom exception for display initialization errors."""
@@ -19,6 +115,14 @@ class DisplayOperationError(Exception):
     """Custom exception for display operation errors."""
     pass
 
+class _NoLock:
+    """Stand-in for the mailbox lock when the render loop shares the core."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
 class Display:
     """
     A class for managing an SH1106 OLED display using I2C communication.
@@ -26,19 +130,46 @@ class Display:
     Attributes:
         width (int): The width of the display in pixels.
         height (int): The height of the display in pixels.
-        show_text (bool): Flag indicating whether text should be displayed.
-        new_text (bool): Flag to indicate if a new text update is required.
-        text (str): The text to display on the screen.
+        show_text (bool): Flag indicating whether text is displayed, owned by the render loop.
+        new_text (bool): Flag indicating that the render loop has not drawn the current text yet.
+        text (str): The text displayed on the screen.
+        wrap (bool): Flag indicating whether texts too wide for one line are word-wrapped instead of scrolled.
+        scroll_speed (int): Scroll speed in pixels per second.
         i2c (I2C): The I2C communication object for the display.
         display (object): The SH1106 display object.
     
     Methods:
-        scale_framebuf(fb_source, width_source, height_source, width_dest, height_dest):
-            Scales a source framebuffer to the target dimensions.
+        glyph(char):
+            Returns the scaled bitmap of a character from the glyph cache.
+        render_text(text):
+            Assembles the scaled framebuffer of a short text from cached glyphs.
+        render_wrapped(layout):
+            Renders a word-wrapped text onto one static frame.
+        render_cached(text, layout):
+            Returns the framebuffer of a text from the LRU render cache.
+        heap_stats():
+            Returns heap-health counters.
+        frame_stats():
+            Returns scroll frame-time histograms.
+        post(text):
+            Hands a new text to the render loop, safe to call from the other core.
+        start():
+            Starts the render loop on the second core.
         print_oled():
             Displays text on the OLED, with scaling and optional scrolling.
+
+    Scrolling texts are never rendered as a whole: only the visible window
+    plus a look-ahead strip of one glyph is kept, and the next glyph is
+    copied in as the scroll advances, so render memory does not depend on
+    the length of the text.
+
+    The render loop runs on the second core of the RP2040 via _thread, so
+    rendering, scrolling and I2C transfers never compete with the network
+    and control code on core 0. Both sides only share the mailbox, which is
+    protected by a lock.
     """
-    def __init__(self, show_text, new_text, text, width=128, height=64, sda_pin=16, scl_pin=17, rotate=180):
+    def __init__(self, show_text, new_text, text, width=128, height=64, sda_pin=16, scl_pin=17, rotate=180, wrap=True,
+                 scroll_speed=SCROLL_SPEED):
         """
         Initializes the Display object and sets up the SH1106 OLED display.
 
@@ -51,15 +182,67 @@ class Display:
             sda_pin (int, optional): Pin number for the I2C SDA line. Defaults to 16.
             scl_pin (int, optional): Pin number for the I2C SCL line. Defaults to 17.
             rotate (int, optional): Display rotation angle. Defaults to 180.
+            wrap (bool, optional): Word-wrap texts too wide for one line. Defaults to True.
+            scroll_speed (int, optional): Scroll speed in pixels per second. Defaults to 100.
 
         Raises:
             DisplayInitializationError: If there is an error initializing the display.
         """
         self.width = width
         self.height = height
-        self.show_text = show_text
+        self.show_text = False
         self.new_text = new_text
         self.text = text
+        self.wrap = wrap
+        self.scroll_speed = scroll_speed
+        self._lock = _thread.allocate_lock() if _thread is not None else _NoLock()
+        self._mail_text = text if show_text else None
+        self._mail_seq = 1 if show_text else 0
+        self._seen_seq = 0
+        self._fb = None
+        self._scroll = False
+        self._scroll_end = 0
+        self._x_offset = 0
+        self._scroll_us = None  # Ticks at which the current scroll pass starts moving, None to restart
+        self._last_frame_us = None
+        self._powered = False
+        # Scroll frame instrumentation: time spent rendering and sending a frame,
+        # and time between two frames as seen by the viewer
+        self.render_histogram = [0] * (len(FRAME_BUCKETS_MS) + 1)
+        self.interval_histogram = [0] * (len(FRAME_BUCKETS_MS) + 1)
+        self.late_frames = 0  # Frames that merged scroll steps because they came late
+        # Framebuffer arena: allocated once and reused for every render, so
+        # the heap does not fragment with text-sized buffers over the day
+        slot_size = max(STATIC_TEXT_LENGTH * GLYPH_SIZE, width * height // 8)
+        self.arena = bytearray(ARENA_SLOTS * slot_size)
+        arena = memoryview(self.arena)
+        self.slots = [arena[i * slot_size:(i + 1) * slot_size] for i in range(ARENA_SLOTS)]
+        # Framebuffer per slot for a static text of one line
+        self.slot_fbs = [framebuf.FrameBuffer(slot, STATIC_TEXT_LENGTH * GLYPH_WIDTH, GLYPH_HEIGHT, framebuf.MONO_VLSB)
+                         for slot in self.slots]
+        # Full-screen framebuffer per slot for word-wrapped texts
+        self.slot_frames = [framebuf.FrameBuffer(slot, width, height, framebuf.MONO_VLSB) for slot in self.slots]
+        self.slot_texts = [None] * ARENA_SLOTS  # Text, or text and layout, rendered into each slot
+        self.slot_used = [None] * ARENA_SLOTS   # Framebuffer holding each slot's text
+        self.render_order = list(range(ARENA_SLOTS))  # Slots, least recently used first
+        self.render_hits = 0
+        self.render_misses = 0
+        # Scroll window: the glyphs covering the visible columns plus one glyph of look-ahead
+        self.window_chars = width // GLYPH_WIDTH + 2
+        self.window_width = self.window_chars * GLYPH_WIDTH
+        self.window = bytearray(self.window_width * GLYPH_PAGES)
+        self._window_view = memoryview(self.window)
+        self.window_fb = framebuf.FrameBuffer(self.window, self.window_width, GLYPH_HEIGHT, framebuf.MONO_VLSB)
+        self._window_text = ""
+        self._window_first = -1  # Index of the character in the leftmost window column, -1 if empty
+        self.min_free = gc.mem_free()
+        self._font_buf = bytearray(FONT_SIZE)
+        self._font_fb = framebuf.FrameBuffer(self._font_buf, FONT_SIZE, FONT_SIZE, framebuf.MONO_VLSB)
+        self.glyph_table = bytearray(len(GLYPH_CHARSET) * GLYPH_SIZE)
+        table = memoryview(self.glyph_table)
+        self.glyphs = {}
+        for i, char in enumerate(GLYPH_CHARSET):
+            self.glyphs[char] = self._scale_glyph(char, table[i * GLYPH_SIZE:(i + 1) * GLYPH_SIZE])
         try:
             import sh1106
             self.i2c = I2C(0, scl=Pin(scl_pin), sda=Pin(sda_pin))
@@ -70,101 +253,431 @@ class Display:
         except Exception as e:
             raise DisplayInitializationError(f"Error initializing the display: {e}")
 
-    def scale_framebuf(self, fb_source, width_source, height_source, width_dest, height_dest):
+    def _scale_glyph(self, char, glyph):
+        """
+        Renders the scaled bitmap of a character into a glyph buffer.
+
+        The glyph is stored in MONO_VLSB layout, one byte per column and page.
+        Because every font row is scaled to 8 pixel rows, each source pixel
+        becomes a whole byte of a page, so scaling needs no per-pixel work.
+
+        Args:
+            char (str): The character.
+            glyph (memoryview): GLYPH_SIZE bytes receiving the glyph, page by page.
+
+        Returns:
+            memoryview: The filled glyph buffer.
+        """
+        self._font_fb.fill(0)
+        self._font_fb.text(char, 0, 0, 1)
+        if scale_glyph is not None:
+            scale_glyph(glyph, self._font_buf, GLYPH_COLUMNS, GLYPH_WIDTH, GLYPH_PAGES)
+        else:
+            columns = self._font_buf
+            for x in range(GLYPH_WIDTH):
+                column = columns[GLYPH_COLUMNS[x]]
+                for page in range(GLYPH_PAGES):
+                    glyph[page * GLYPH_WIDTH + x] = 0xFF if column >> page & 1 else 0
+        return glyph
+
+    def glyph(self, char):
+        """
+        Returns the scaled bitmap of a character from the glyph cache.
+
+        Glyphs of GLYPH_CHARSET are built into one table at boot, other
+        characters are rendered on first use.
+
+        Args:
+            char (str): The character.
+
+        Returns:
+            memoryview: GLYPH_SIZE bytes, page by page.
+        """
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            glyph = self._scale_glyph(char, memoryview(bytearray(GLYPH_SIZE)))
+            self.glyphs[char] = glyph
+        return glyph
+
+    def _put_glyph(self, dest, width, i, char):
+        """Copies the glyph of a character into column i * GLYPH_WIDTH of a buffer width pixels wide."""
+        glyph = self.glyph(char)
+        x = i * GLYPH_WIDTH
+        for page in range(GLYPH_PAGES):
+            row = page * width + x
+            dest[row:row + GLYPH_WIDTH] = glyph[page * GLYPH_WIDTH:(page + 1) * GLYPH_WIDTH]
+
+    def render_text(self, text, slot=0):
         """
-        Scales a source framebuffer to a destination size.
+        Assembles the scaled framebuffer of a short text from cached glyphs into an arena slot.
 
         Args:
-            fb_source (FrameBuffer): The source framebuffer.
-            width_source (int): The width of the source framebuffer.
-            height_source (int): The height of the source framebuffer.
-            width_dest (int): The width of the destination framebuffer.
-            height_dest (int): The height of the destination framebuffer.
+            text (str): The text to render, padded with spaces to STATIC_TEXT_LENGTH
+                characters and cut there.
+            slot (int, optional): Arena slot receiving the framebuffer. Defaults to 0.
 
         Returns:
-            FrameBuffer: The scaled framebuffer.
+            FrameBuffer: MONO_VLSB framebuffer of the padded text, GLYPH_WIDTH pixels per character.
 
         Raises:
-            FramebufferScalingError: If there is an error during scaling.
+            FramebufferScalingError: If there is an error while rendering.
         """
         try:
-            fb_dest = framebuf.FrameBuffer(bytearray(width_dest * height_dest // 8), width_dest, height_dest, framebuf.MONO_HLSB)  
-            x_ratio = width_source / width_dest
-            y_ratio = height_source / height_dest
-
-            for y in range(height_dest):
-                for x in range(width_dest):
-                    px = int(x * x_ratio)
-                    py = int(y * y_ratio)
-                    color = fb_source.pixel(px, py)
-                    fb_dest.pixel(x, y, color)
-
-            return fb_dest
+            dest = self.slots[slot]
+            width = STATIC_TEXT_LENGTH * GLYPH_WIDTH
+            for i in range(STATIC_TEXT_LENGTH):
+                self._put_glyph(dest, width, i, text[i] if i < len(text) else " ")
+            return self.slot_fbs[slot]
         except Exception as e:
-            raise FramebufferScalingError(f"Error while scaling framebuffer: {e}")
-    
-    async def print_oled(self):
+            raise FramebufferScalingError(f"Error while rendering text: {e}")
+
+    def _fill_window(self, first):
+        """Copies the glyphs of the scroll text from character first on into the scroll window."""
+        text = self._window_text
+        for i in range(self.window_chars):
+            n = first + i
+            self._put_glyph(self._window_view, self.window_width, i, text[n] if n < len(text) else " ")
+        self._window_first = first
+
+    def _advance_window(self):
+        """Shifts the scroll window left by one glyph and copies the next glyph into the look-ahead strip."""
+        window = self._window_view
+        width = self.window_width
+        keep = width - GLYPH_WIDTH
+        # The spans overlap, so they are copied front to back instead of by
+        # slice assignment, which is a memcpy and allocates two slices
+        for page in range(GLYPH_PAGES):
+            row = page * width
+            if shift_left is not None:
+                shift_left(window, row, keep, GLYPH_WIDTH)
+            else:
+                for i in range(row, row + keep):
+                    window[i] = window[i + GLYPH_WIDTH]
+        self._window_first += 1
+        n = self._window_first + self.window_chars - 1
+        text = self._window_text
+        self._put_glyph(window, width, self.window_chars - 1, text[n] if n < len(text) else " ")
+
+    def load_scroll_text(self, text):
+        """
+        Sets the text streamed through the scroll window.
+
+        The window is refilled from the start of the text on the next call of scroll_window().
+
+        Args:
+            text (str): The text to scroll, padded with spaces to whole blocks of 8 characters.
+        """
+        self._window_text = text
+        self._window_first = -1
+
+    def scroll_window(self, x_offset):
         """
-        Displays text on the OLED screen. If the text exceeds the display width, it will scroll.
+        Moves the scroll window so that it covers the display columns from x_offset on.
 
-        This method handles scaling, optional scrolling for longer text, and display updates.
+        Jumping backwards (e.g. when the scroll restarts) refills the window,
+        moving forwards copies in one glyph per GLYPH_WIDTH pixels.
+
+        Args:
+            x_offset (int): Scroll position in pixels of the scaled text.
+
+        Returns:
+            int: Display x coordinate at which window_fb has to be blitted.
+        """
+        first = x_offset // GLYPH_WIDTH
+        if first < self._window_first or self._window_first < 0 or first - self._window_first >= self.window_chars:
+            self._fill_window(first)
+        while self._window_first < first:
+            self._advance_window()
+        return self._window_first * GLYPH_WIDTH - x_offset
+
+    def render_wrapped(self, layout, slot=0):
+        """
+        Renders word-wrapped lines onto one static frame in an arena slot.
+
+        Every font pixel becomes a scale_x by scale_y rectangle, lines are
+        centered horizontally and the block of lines vertically.
+
+        Args:
+            layout (tuple): (horizontal scale, vertical scale, lines) from wrap_layout.
+            slot (int, optional): Arena slot receiving the frame. Defaults to 0.
+
+        Returns:
+            FrameBuffer: MONO_VLSB framebuffer of the display size.
+
+        Raises:
+            FramebufferScalingError: If there is an error while rendering.
+        """
+        try:
+            scale_x, scale_y, lines = layout
+            fb = self.slot_frames[slot]
+            fb.fill(0)
+            char_width = FONT_SIZE * scale_x
+            line_height = FONT_SIZE * scale_y
+            y = (self.height - len(lines) * line_height) // 2
+            for line in lines:
+                x = (self.width - len(line) * char_width) // 2
+                for char in line:
+                    self._font_fb.fill(0)
+                    self._font_fb.text(char, 0, 0, 1)
+                    for fx in range(FONT_SIZE):
+                        column = self._font_buf[fx]
+                        for fy in range(FONT_SIZE):
+                            if column >> fy & 1:
+                                fb.fill_rect(x + fx * scale_x, y + fy * scale_y, scale_x, scale_y, 1)
+                    x += char_width
+                y += line_height
+            return fb
+        except Exception as e:
+            raise FramebufferScalingError(f"Error while rendering wrapped text: {e}")
+
+    def render_cached(self, text, layout=None):
+        """
+        Returns the framebuffer of a text, rendering it only if it is not cached.
+
+        The arena slots double as LRU cache: recently shown texts (e.g. the
+        startup text or a message that is shown again) are still in their slot,
+        a new text is rendered into the least recently used slot.
+
+        Args:
+            text (str): The text to render.
+            layout (tuple, optional): Word-wrapped layout from wrap_layout, None for
+                one scaled line. Defaults to None.
+
+        Returns:
+            FrameBuffer: The framebuffer of the text.
+        """
+        key = text if layout is None else (text, layout[0], layout[1])
+        if key in self.slot_texts:
+            slot = self.slot_texts.index(key)
+            fb = self.slot_used[slot]
+            self.render_hits += 1
+        else:
+            slot = self.render_order[0]
+            self.slot_texts[slot] = None
+            if layout is None:
+                fb = self.render_text(text, slot)
+            else:
+                fb = self.render_wrapped(layout, slot)
+            self.slot_texts[slot] = key
+            self.slot_used[slot] = fb
+            self.render_misses += 1
+        self.render_order.remove(slot)
+        self.render_order.append(slot)
+        self._sample_heap()
+        return fb
+
+    def _sample_heap(self):
+        free = gc.mem_free()
+        if free < self.min_free:
+            self.min_free = free
+
+    def heap_stats(self):
+        """
+        Returns heap-health counters.
+
+        Returns:
+            dict: Free and allocated heap bytes, the lowest free heap seen by the
+                render loop, arena and scroll window size and render cache hits and misses.
+        """
+        self._sample_heap()
+        return {
+            'free': gc.mem_free(),
+            'alloc': gc.mem_alloc(),
+            'min_free': self.min_free,
+            'arena': len(self.arena),
+            'window': len(self.window),
+            'glyphs': len(self.glyphs),
+            'render_hits': self.render_hits,
+            'render_misses': self.render_misses,
+        }
+
+    def frame_stats(self):
+        """
+        Returns scroll frame-time histograms.
+
+        Returns:
+            dict: Bucket bounds in milliseconds, counts of frame render times and
+                of intervals between frames per bucket, the number of late frames
+                and the scroll speed.
+        """
+        return {
+            'buckets_ms': FRAME_BUCKETS_MS,
+            'render': self.render_histogram,
+            'interval': self.interval_histogram,
+            'late': self.late_frames,
+            'speed': self.scroll_speed,
+        }
+
+    def post(self, text):
+        """
+        Hands a new text to the render loop through the mailbox.
+
+        This is the only method meant to be called from the network and control
+        code on core 0, it never touches the I2C bus.
+
+        Args:
+            text (str): The text to display, None to clear the display.
+        """
+        with self._lock:
+            self._mail_text = text
+            self._mail_seq += 1
+
+    def _take_mail(self):
+        """Applies a text posted since the last frame, returns True if there was one."""
+        with self._lock:
+            if self._mail_seq == self._seen_seq:
+                return False
+            self._seen_seq = self._mail_seq
+            text = self._mail_text
+        self.show_text = text is not None
+        if self.show_text:
+            self.text = text
+        self.new_text = True
+        return True
+
+    def _frame(self):
+        """
+        Renders one step of the display and returns the milliseconds until the next one.
+
+        A new text is rendered once. Texts wider than the display are
+        word-wrapped onto a static frame at a smaller scale if possible,
+        otherwise they scroll at scroll_speed pixels per second, pausing at
+        the start. The scroll position follows the elapsed time rather than a
+        frame count, so frames that come late (e.g. while core 0 holds the
+        bus) merge steps instead of slowing the text down. After the text is cleared
+        the display stays on for a second before it is blanked and switched off.
 
         Raises:
             DisplayOperationError: If there is an error during display operations.
         """
-        while True:
-            while self.show_text:
-                if not self.display:
-                    raise DisplayOperationError("Display was not properly initialized!")
-                self.display.poweron()
-                try:
-                    # Scaling factors for text dimensions
-                    letter_scale_factor_width = 2.25
-                    letter_scale_factor_height = 8
-
-                    # Calculate dimensions and pad text if needed
-                    width_length_old_pixel = len(self.text) * letter_scale_factor_width * 8
-                    new_text = self.text
-                    padding_length = 8 - (len(new_text) % 8)
-                    if len(new_text) % 8 != 0:
-                        new_text += " " * padding_length
-
-                    text_length = len(new_text)
-                    text_width_pixel = text_length * 8
-                    scaled_text_width_pixel = int(text_width_pixel * letter_scale_factor_width)
-                    scaled_text_height_pixel = int(8 * letter_scale_factor_height)
-                    
-                    # Create original and scaled framebuffers
-                    fb_original = framebuf.FrameBuffer(bytearray(text_width_pixel), text_width_pixel, 8, framebuf.MONO_HLSB)
-                    fb_original.text(new_text, 0, 0, 1)
-                    fb_scaled = self.scale_framebuf(fb_original, text_width_pixel, 8, scaled_text_width_pixel, scaled_text_height_pixel)
-                    
-                    while not self.new_text:
-                        if width_length_old_pixel > self.width - 10:
-                            # Scroll text if it exceeds display width
-                            for x_offset in range(0, scaled_text_width_pixel - 95, 2):
-                                if self.new_text:
-                                    break
-                                self.display.blit(fb_scaled, -x_offset, 0)
-                                self.display.show()
-                                if x_offset == 0:
-                                    await uasyncio.sleep(0.8)
-                                await uasyncio.sleep(0.01)
-                        else:
-                            # Display static text if it fits
-                            self.display.blit(fb_scaled, 0, 0)
-                            self.display.show()
-                            await uasyncio.sleep(1)
-    
-                    self.new_text = False
-                except Exception as e:
-                    self.display.fill(0)
-                    self.display.show()
-                    self.display.poweroff()
-                    raise DisplayOperationError(f"Error displaying text: {e}")
-        
-            await uasyncio.sleep(1)
+        if not self.display:
+            raise DisplayOperationError("Display was not properly initialized!")
+        display = self.display
+        if self._take_mail() and self.show_text:
+            # Pad text to whole blocks of 8 characters
+            new_text = self.text
+            if len(new_text) % 8 != 0:
+                new_text += " " * (8 - len(new_text) % 8)
+            self._scroll = len(self.text) * GLYPH_WIDTH > self.width - 10
+            self._scroll_end = len(new_text) * GLYPH_WIDTH - 95
+            self._x_offset = 0
+            self._scroll_us = None
+            layout = wrap_layout(self.text, self.width, self.height) if self._scroll and self.wrap else None
+            if layout is not None:
+                # Word-wrapped text is drawn once like a static text
+                self._scroll = False
+                self._fb = self.render_cached(self.text, layout)
+            elif self._scroll:
+                # Scrolling text is streamed through the scroll window glyph by glyph
+                self.load_scroll_text(new_text)
+                self._fb = self.window_fb
+            else:
+                # Assemble the scaled framebuffer from cached glyphs or take it from the render cache
+                self._fb = self.render_cached(new_text)
+            display.poweron()
+            self._powered = True
+
+        if not self.show_text:
+            self._fb = None
+            if self.new_text:
+                self.new_text = False
+                return 1000
+            if self._powered:
+                display.fill(0)
+                display.show()
+                display.poweroff()
+                self._powered = False
+            return IDLE_POLL_MS
+
+        if not self._scroll:
+            # Static text is drawn once and left on screen
+            if self.new_text:
+                self.new_text = False
+                display.blit(self._fb, 0, 0)
+                display.show()
+            return IDLE_POLL_MS
+
+        # Scroll text if it exceeds display width
+        self.new_text = False
+        started = time.ticks_us()
+        x_offset = 0
+        if self._scroll_us is not None:
+            # Milliseconds first, microseconds times speed would leave the small-int
+            # range after about 10 s and allocate a long int every frame
+            x_offset = max(0, time.ticks_diff(started, self._scroll_us)) // 1000 * self.scroll_speed // 1000
+            if x_offset >= self._scroll_end:
+                # Start the next pass from the beginning of the text
+                self._scroll_us = None
+                x_offset = 0
+        display.blit(self._fb, self.scroll_window(x_offset), 0)
+        display.show()
+        finished = time.ticks_us()
+        record_frame_time(self.render_histogram, time.ticks_diff(finished, started))
+
+        if self._scroll_us is None:
+            self._scroll_us = time.ticks_add(finished, SCROLL_PAUSE_MS * 1000)
+            self._last_frame_us = None
+            self._x_offset = 0
+            return SCROLL_PAUSE_MS
+        if self._last_frame_us is not None:
+            interval = time.ticks_diff(started, self._last_frame_us)
+            record_frame_time(self.interval_histogram, interval)
+            if interval > 2 * FRAME_INTERVAL_MS * 1000:
+                self.late_frames += 1
+        self._last_frame_us = started
+        self._x_offset = x_offset
+        return max(1, FRAME_INTERVAL_MS - time.ticks_diff(finished, started) // 1000)
+
+    def _fail(self, e):
+        print("Error displaying text:", e)
+        self.show_text = False
+        self._fb = None
+        try:
             self.display.fill(0)
             self.display.show()
             self.display.poweroff()
-        await uasyncio.sleep(1)
+        except Exception:
+            pass
+        self._powered = False
+
+    def render_loop(self):
+        """
+        Runs the display pipeline (rendering, scrolling, I2C transfers) forever.
+
+        Meant to run on the second core, started by start().
+        """
+        while True:
+            try:
+                delay = self._frame()
+            except Exception as e:
+                self._fail(e)
+                delay = 1000
+            time.sleep_ms(delay)
+
+    async def print_oled(self):
+        """
+        Displays text on the OLED screen from a uasyncio task. If the text exceeds the display width, it will scroll.
+
+        Fallback for ports without _thread, the same pipeline as render_loop
+        runs on the event loop instead of the second core.
+        """
+        while True:
+            try:
+                delay = self._frame()
+            except Exception as e:
+                self._fail(e)
+                delay = 1000
+            await uasyncio.sleep_ms(delay)
+
+    def start(self):
+        """
+        Starts the render loop on the second core, or as uasyncio task if threads are not available.
+
+        Returns:
+            bool: True if the render loop runs on the second core.
+        """
+        if _thread is not None:
+            _thread.start_new_thread(self.render_loop, ())
+            return True
+        uasyncio.create_task(self.print_oled())
+        return False
@@ -0,0 +1,162 @@
+# Copyright (c) 2025 Simon Klenk
+# This software is licensed under the MIT License.
+# See the LICENSE file in the project directory for the full license text.
+
+import uasyncio
+import ujson
+
+
+class HTTPError(Exception):
+    """Custom exception for malformed or interrupted HTTP responses."""
+    pass
+
+
+class HTTPResponse:
+    """
+    Response of an HTTPClient request.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        content (bytes): The response body.
+    """
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return ujson.loads(self.content)
+
+
+class HTTPClient:
+    """
+    Minimal non-blocking HTTP/1.1 client for JSON calls to a single host.
+
+    The connection is opened with uasyncio.open_connection and kept alive
+    between requests, so status updates do not pay for a new TCP handshake
+    each time. Every request has a timeout and never blocks the event loop.
+    Requests are serialized over the one connection by a lock.
+
+    Attributes:
+        host (str): The server host name or IP address.
+        port (int): The server port.
+        timeout (float): Seconds allowed for connecting and for each request.
+    """
+    def __init__(self, host, port=80, timeout=5):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+        self.lock = uasyncio.Lock()
+
+    async def _connect(self):
+        self.reader, self.writer = await uasyncio.wait_for(
+            uasyncio.open_connection(self.host, self.port), self.timeout)
+
+    def close(self):
+        """Closes the kept-alive connection, the next request reconnects."""
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except Exception:
+                pass
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, json=None):
+        """
+        Sends a request and reads the complete response.
+
+        A request on a reused connection that the server closed in the
+        meantime is retried once on a fresh connection.
+
+        Args:
+            method (str): The HTTP method, e.g. "PATCH".
+            path (str): The request path, e.g. "/api/messages/1/".
+            json (dict, optional): Payload sent as JSON body.
+
+        Returns:
+            HTTPResponse: The response of the server.
+
+        Raises:
+            OSError: If the server cannot be reached.
+            uasyncio.TimeoutError: If connecting or the request takes longer than the timeout.
+            HTTPError: If the response is malformed.
+            ValueError: If a length in the response headers is malformed.
+        """
+        body = ujson.dumps(json).encode() if json is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode()
+
+        async with self.lock:
+            for attempt in range(2):
+                reused = self.writer is not None
+                try:
+                    if not reused:
+                        await self._connect()
+                    return await uasyncio.wait_for(self._exchange(head, body), self.timeout)
+                except uasyncio.TimeoutError:
+                    self.close()
+                    raise
+                except (OSError, EOFError):
+                    self.close()
+                    if not reused or attempt:
+                        raise
+                except Exception:
+                    # A half-read response would be parsed by the next request
+                    self.close()
+                    raise
+
+    async def _exchange(self, head, body):
+        self.writer.write(head + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise EOFError("Connection closed by server")
+        try:
+            status_code = int(status_line.split(None, 2)[1])
+        except (IndexError, ValueError):
+            raise HTTPError(f"Invalid status line: {status_line}")
+
+        length = None
+        chunked = False
+        keep_alive = True
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise EOFError("Connection closed in headers")
+            if line == b"\r\n":
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"transfer-encoding":
+                chunked = value == b"chunked"
+            elif name == b"connection":
+                keep_alive = value != b"close"
+
+        if chunked:
+            content = b""
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if not size:
+                    await self.reader.readline()
+                    break
+                content += await self.reader.readexactly(size)
+                await self.reader.readline()
+        elif length is not None:
+            content = await self.reader.readexactly(length)
+        else:
+            content = await self.reader.read(-1)
+            keep_alive = False
+
+        if not keep_alive:
+            self.close()
+        return HTTPResponse(status_code, content)
@@ -0,0 +1,94 @@
+# Copyright (c) 2025 Simon Klenk
+# This software is licensed under the MIT License.
+# See the LICENSE file in the project directory for the full license text.
+
+"""
+Viper kernels for the hot pixel and byte loops of the OLED pipeline.
+
+Viper code is compiled to machine code on import. Ports without the native
+emitter fail to import this module, sh1106.py and display.py then fall back
+to their pure-Python versions of the same functions.
+"""
+
+import micropython
+
+
+@micropython.viper
+def remap_rotate90(db, rb, w: int, p: int):
+    # byte-for-byte remap of the HMSB render buffer into the VLSB display buffer
+    d = ptr8(db)
+    r = ptr8(rb)
+    i = 0
+    col = 0
+    while col < w:
+        page = 0
+        while page < p:
+            d[w * page + col] = r[i]
+            i += 1
+            page += 1
+        col += 1
+
+
+@micropython.viper
+def first_dirty(db, sb, start: int, width: int) -> int:
+    d = ptr8(db)
+    s = ptr8(sb)
+    first = 0
+    while first < width:
+        if d[start + first] != s[start + first]:
+            return first
+        first += 1
+    return -1
+
+
+@micropython.viper
+def last_dirty(db, sb, start: int, width: int) -> int:
+    d = ptr8(db)
+    s = ptr8(sb)
+    last = width - 1
+    while last > 0:
+        if d[start + last] != s[start + last]:
+            return last
+        last -= 1
+    return last
+
+
+@micropython.viper
+def scale_glyph(glyph, font, columns, width: int, pages: int):
+    # every font pixel becomes a whole page byte, columns maps glyph to font columns
+    g = ptr8(glyph)
+    f = ptr8(font)
+    c = ptr8(columns)
+    x = 0
+    while x < width:
+        column = f[c[x]]
+        page = 0
+        while page < pages:
+            if (column >> page) & 1:
+                g[page * width + x] = 0xFF
+            else:
+                g[page * width + x] = 0
+            page += 1
+        x += 1
+
+
+@micropython.viper
+def copy_span(dst, src, n: int):
+    d = ptr8(dst)
+    s = ptr8(src)
+    i = 0
+    while i < n:
+        d[i] = s[i]
+        i += 1
+
+
+@micropython.viper
+def shift_left(buf, start: int, n: int, by: int):
+    # moves n bytes from start + by down to start, front to back, so the
+    # overlapping spans of the scroll window are copied correctly
+    b = ptr8(buf)
+    i = start
+    end = start + n
+    while i < end:
+        b[i] = b[i + by]
+        i += 1
@@ -5,29 +5,41 @@
 import uasyncio
 import ujson
 import network
-from microdot import Microdot
+from microdot import Microdot, Request
 import machine
-import urequests
 import ubinascii
 from display import Display
+from message_queue import MessageQueue, MAX_TEXT_LENGTH
+from buttons import Button
+from http_client import HTTPClient
+from outbox import Outbox
 import time
 import re
 
 BACKEND_IP = "192.168.104.45"
-BACKEND_URL_MESSAGES = f"http://{BACKEND_IP}/api/messages/"
-BACKEND_URL_CLEAR = f"http://{BACKEND_IP}/api/clear/"
+BACKEND_PATH_MESSAGES = "/api/messages/"
+BACKEND_PATH_CLEAR = "/api/clear/"
+BACKEND_TIMEOUT = 5  # Seconds per backend request
 
 LED_ALERT_PIN = 2
 BUTTON_ACCEPT_PIN = 15
 BUTTON_REJECT_PIN = 14
 
+QUEUE_CAPACITY = 8  # Messages that can wait for a decision at the same time
+DECISION_LOCKOUT_MS = 1000  # Presses right after a decision are ignored, the next message just appeared
+
 led_alert = machine.Pin(LED_ALERT_PIN, machine.Pin.OUT)
-button_accept = machine.Pin(BUTTON_ACCEPT_PIN, machine.Pin.IN, machine.Pin.PULL_DOWN)
-button_reject = machine.Pin(BUTTON_REJECT_PIN, machine.Pin.IN, machine.Pin.PULL_DOWN)
+button_pressed = uasyncio.ThreadSafeFlag()
+button_accept = Button(BUTTON_ACCEPT_PIN, button_pressed)
+button_reject = Button(BUTTON_REJECT_PIN, button_pressed)
+press_latency_us = 0  # Time from the last press to the start of its action
 
 app = Microdot()
+# The routes only read JSON bodies, every other request header is skipped while parsing
+Request.kept_headers = ('content-length', 'content-type')
+backend = HTTPClient(BACKEND_IP, timeout=BACKEND_TIMEOUT)
 
-message_id = 0
+message_queue = MessageQueue(QUEUE_CAPACITY)
 led_alert_light = False
 
 oled_display = Display(show_text=False, new_text=False, text="Start...")
@@ -91,7 +103,7 @@ def sanitize_text(text):
       - 'ß' with 'ss'
     
     It then removes all characters except letters, numbers, spaces, and specific punctuation,
-    and finally limits the length of the text to 50 characters.
+    and finally limits the length of the text to MAX_TEXT_LENGTH characters.
     
     Args:
         text (str): The input text to be sanitized.
@@ -110,11 +122,30 @@ def sanitize_text(text):
     text = re.sub(r'[^a-zA-Z0-9 .,?!-]', '', text)
     text = text.strip()
     
-    if len(text) > 50:
-        text = text[:50]
+    if len(text) > MAX_TEXT_LENGTH:
+        text = text[:MAX_TEXT_LENGTH]
     return text
 
 
+def show_next_message():
+    """
+    Shows the oldest waiting message on the OLED, or clears it if none is left.
+
+    If more messages are waiting, the text is prefixed with the queue position
+    (e.g. "1/3") so the staff knows how many decisions are pending.
+    """
+    global led_alert_light
+
+    msg_id, text = message_queue.peek()
+    if text is None:
+        led_alert_light = False
+    else:
+        led_alert_light = True
+        if len(message_queue) > 1:
+            text = f"1/{len(message_queue)} {text}"
+    oled_display.post(text)
+
+
 @app.route('/', methods=['POST'])
 async def handle_message(request):
     """
@@ -124,7 +155,10 @@ async def handle_message(request):
       - "message": The text message to be displayed.
       - "id": A unique identifier for the message.
     
-    The function sanitizes the text and updates the display. An alert LED is also activated.
+    The function sanitizes the text and appends it to the queue of waiting
+    messages. The oldest waiting message is shown on the display and the alert
+    LED is activated. If the queue is full, the message is refused with 429 so
+    the backend can hand it to another station.
     
     Args:
         request: The HTTP request object.
@@ -132,8 +166,6 @@ async def handle_message(request):
     Returns:
         tuple: A JSON response with a status message and HTTP status code.
     """
-    global message_id, led_alert_light
-
     if not request.body:
         return {'error': 'Empty body'}, 400
 
@@ -147,20 +179,46 @@ async def handle_message(request):
         return {'error': 'Missing "message" or "id" field in JSON'}, 400
 
     sanitized = sanitize_text(data['message'])
-    if sanitized:
-        message_id = data['id']
-        led_alert_light = True
+    if not sanitized:
+        print("Text is not valid")
+        return {'status': 'Message received'}, 200
 
-        oled_display.text = sanitized
-        oled_display.show_text = True
-        oled_display.new_text = True
+    if not message_queue.push(data['id'], sanitized):
+        print("Message queue full, refusing message", data['id'])
+        return {'error': 'Queue full', 'capacity': QUEUE_CAPACITY}, 429
 
-    else:
-        print("Text is not valid")
-        oled_display.show_text = False
-        oled_display.new_text = True
+    show_next_message()
+    return {'status': 'Message received', 'position': message_queue.position(data['id']) + 1}, 200
+
+@app.route('/withdraw', methods=['POST'])
+async def withdraw_message(request):
+    """
+    Handles POST requests to the '/withdraw' endpoint.
+
+    The backend withdraws a message once it was approved or rejected on another
+    station. The message is removed from the queue and the display moves on if
+    it was the one currently shown.
+
+    Args:
+        request: The HTTP request object with a JSON payload containing "id".
+
+    Returns:
+        tuple: A JSON response with a status message and HTTP status code.
+    """
+    try:
+        data = request.json
+    except Exception as e:
+        print("JSON decoding error:", e)
+        return {'error': 'Invalid JSON body'}, 400
+
+    if not data or 'id' not in data:
+        return {'error': 'Missing "id" field in JSON'}, 400
 
-    return {'status': 'Message received'}, 200
+    if message_queue.remove(data['id']) >= 0:
+        show_next_message()
+        return {'status': 'Message withdrawn'}, 200
+
+    return {'status': 'Message not pending'}, 200
 
 @app.route('/live', methods=['GET'])
 async def check_status(request):
@@ -173,80 +231,118 @@ async def check_status(request):
     Returns:
         tuple: A JSON response with status information and HTTP status code 200.
     """
-    return {'status': 'running'}, 200
+    return {'status': 'running', 'queued': len(message_queue), 'press_latency_ms': press_latency_us / 1000}, 200
+
+@app.route('/stats', methods=['GET'])
+async def stats(request):
+    """
+    Handles GET requests to the '/stats' endpoint.
+
+    Reports heap-health counters of the firmware, e.g. to confirm that free
+    memory does not shrink over a day of operation, and the frame-time
+    histograms of the OLED scroll loop.
+
+    Returns:
+        tuple: A JSON response with heap, render and frame counters and HTTP status code 200.
+    """
+    return {'heap': oled_display.heap_stats(), 'frames': oled_display.frame_stats(),
+            'queued': len(message_queue)}, 200
 
 async def update_message_status(msg_id, status):
     """
     Sends a PATCH request to update the message status on the backend.
     
-    The function constructs the URL using the given message ID and sends a JSON payload
-    containing the status (e.g., "approved" or "rejected").
+    The function constructs the path using the given message ID and sends a JSON payload
+    containing the status (e.g., "approved" or "rejected"). The request runs on the
+    non-blocking backend client, so the display, LED and HTTP server keep running
+    while the backend answers.
     
     Args:
         msg_id (int): The unique identifier of the message.
         status (str): The new status for the message.
-    
+
+    Returns:
+        bool: True if the backend handled the update, False if it should be retried.
+
     Raises:
-        Exception: If there is an error sending the request.
+        Exception: If the backend cannot be reached.
+    """
+    response = await backend.request("PATCH", f"{BACKEND_PATH_MESSAGES}{msg_id}/", {"status": status})
+    if response.status_code == 200:
+        print(f"Status successfully sent to backend: {status}")
+    elif response.status_code == 409:
+        print(f"Message {msg_id} was already decided on another station")
+    else:
+        print(f"Error sending status to backend: {response.status_code}")
+    # Client errors will not go away by retrying
+    return response.status_code < 500
+
+
+# Status updates are stored on flash until the backend confirmed them
+outbox = Outbox(update_message_status)
+
+
+async def clear_display():
+    """
+    Sends a POST request to clear the Resolume layer via the backend.
     """
-    url = f"{BACKEND_URL_MESSAGES}{msg_id}/"
     try:
-        response = urequests.patch(url, json={"status": status})
+        response = await backend.request("POST", BACKEND_PATH_CLEAR, {"clear": True})
         if response.status_code == 200:
-            print(f"Status successfully sent to backend: {status}")
+            print(f"Clear successfully sent to backend")
         else:
-            print(f"Error sending status to backend: {response.status_code}")
+            print(f"Error sending clear to backend: {response.status_code}")
     except Exception as e:
-        print("Error sending status:", e)
-    finally:
-        try:
-            response.close()
-        except Exception:
-            pass
+        print("Error sending clear:", e)
 
 
 async def monitor_buttons():
     """
-    Monitors the state of the accept and reject buttons.
+    Handles presses of the accept and reject buttons.
     
+    The task sleeps until a button interrupt sets the button_pressed flag.
     When a button is pressed:
-      - The "accept" button sends an "approved" status.
-      - The "reject" button sends a "rejected" status.
+      - The "accept" button sends an "approved" status for the oldest waiting message.
+      - The "reject" button sends a "rejected" status for the oldest waiting message.
+      - The "reject" button clears the Resolume layer if no message is waiting.
     
-    After sending the status, the function resets the message display and the LED alert.
+    The status is handed to the flash-backed outbox, which delivers it in the
+    background, so the message leaves the queue and the next one is shown at once.
+    Presses during DECISION_LOCKOUT_MS after an action are ignored.
     """
-    global message_id, led_alert_light
+    global led_alert_light, press_latency_us
 
     await uasyncio.sleep(2)
+    button_accept.take()
+    button_reject.take()
 
     while True:
-        if button_accept.value() == 1 and oled_display.show_text:
-            await update_message_status(message_id, "approved")
-            led_alert_light = False
-            message_id = 0
-            oled_display.show_text = False
-            oled_display.new_text = True
-            await uasyncio.sleep(2)
-        elif button_reject.value() == 1 and oled_display.show_text:
-            await update_message_status(message_id, "rejected")
+        await button_pressed.wait()
+        accepted = button_accept.take()
+        rejected = button_reject.take()
+        msg_id, _ = message_queue.peek()
+
+        if accepted and msg_id:
+            press_latency_us = button_accept.latency_us()
+            outbox.put(msg_id, "approved")
+            message_queue.remove(msg_id)
+            show_next_message()
+        elif rejected and msg_id:
+            press_latency_us = button_reject.latency_us()
+            outbox.put(msg_id, "rejected")
+            message_queue.remove(msg_id)
+            show_next_message()
+        elif rejected:
+            press_latency_us = button_reject.latency_us()
+            await clear_display()
             led_alert_light = False
-            message_id = 0
-            oled_display.show_text = False
-            oled_display.new_text = True
-            await uasyncio.sleep(2)
-        elif button_reject.value() == 1 and not oled_display.show_text:
-            try:
-                response = urequests.post(BACKEND_URL_CLEAR, json={"clear": True})
-                if response.status_code == 200:
-                    print(f"Clear successfully sent to backend")
-                else:
-                    print(f"Error sending clear to backend: {response.status_code}")
-            except Exception as e:
-                print("Error sending clear:", e)
-            led_alert_light = False
-            message_id = 0
-            await uasyncio.sleep(2)
-        await uasyncio.sleep(0.2)
+        else:
+            continue
+
+        print(f"Button press handled after {press_latency_us} us")
+        await uasyncio.sleep_ms(DECISION_LOCKOUT_MS)
+        button_accept.take()
+        button_reject.take()
 
 
 async def control_LED():
@@ -285,14 +381,12 @@ async def startup_display():
     """
     Displays a startup message on the OLED display for 7 seconds.
     
-    The display is updated with the message "Start...", then turned off after the delay.
+    The display is updated with the message "Start...", then switches to the
+    waiting messages (if any arrived meanwhile) after the delay.
     """
-    oled_display.text = "Okay"
-    oled_display.show_text = True
-    oled_display.new_text = True
+    oled_display.post("Okay")
     await uasyncio.sleep(5)
-    oled_display.show_text = False
-    oled_display.new_text = True
+    show_next_message()
 
 
 def main():
@@ -301,17 +395,19 @@ def main():
     
     This function:
       - Connects to the Wi-Fi network.
-      - Creates asynchronous tasks for monitoring buttons, controlling the LED,
-        running the HTTP server, updating the OLED display, and showing the startup message.
+      - Creates asynchronous tasks for monitoring buttons, delivering status updates, controlling the LED,
+        running the HTTP server and showing the startup message.
+      - Starts the OLED render loop on the second core.
       - Runs the event loop indefinitely.
     """
     connect_wifi()
 
     loop = uasyncio.get_event_loop()
     loop.create_task(monitor_buttons())
+    loop.create_task(outbox.run())
     loop.create_task(control_LED())
     loop.create_task(start_http_server())
-    loop.create_task(oled_display.print_oled())
+    oled_display.start()
     loop.create_task(startup_display())
     loop.run_forever()
 
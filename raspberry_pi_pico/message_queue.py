@@ -0,0 +1,128 @@
+# Copyright (c) 2025 Simon Klenk
+# This software is licensed under the MIT License.
+# See the LICENSE file in the project directory for the full license text.
+
+MAX_TEXT_LENGTH = 100  # Longest text after sanitize_text
+
+
+class MessageQueue:
+    """
+    Fixed-capacity ring buffer of messages waiting for a decision.
+
+    All storage is allocated once, texts are copied into preallocated byte
+    slots, so queueing and removing messages does not churn the heap.
+
+    Attributes:
+        capacity (int): Maximum number of waiting messages.
+        count (int): Number of waiting messages.
+    """
+    def __init__(self, capacity=8, max_text_length=MAX_TEXT_LENGTH):
+        """
+        Initializes the ring buffer.
+
+        Args:
+            capacity (int, optional): Maximum number of waiting messages. Defaults to 8.
+            max_text_length (int, optional): Bytes reserved per text. Defaults to 100.
+        """
+        self.capacity = capacity
+        self.max_text_length = max_text_length
+        self.ids = [0] * capacity
+        self.lengths = bytearray(capacity)
+        self.texts = bytearray(capacity * max_text_length)
+        self._view = memoryview(self.texts)
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def is_full(self):
+        return self.count == self.capacity
+
+    def _slot(self, position):
+        """Returns the buffer index of the message at a queue position (0 = oldest)."""
+        return (self.head + position) % self.capacity
+
+    def _store(self, slot, msg_id, text):
+        data = text.encode()[:self.max_text_length]
+        start = slot * self.max_text_length
+        self._view[start:start + len(data)] = data
+        self.lengths[slot] = len(data)
+        self.ids[slot] = msg_id
+
+    def position(self, msg_id):
+        """
+        Returns the queue position of a message.
+
+        Args:
+            msg_id (int): The unique identifier of the message.
+
+        Returns:
+            int: 0-based position, -1 if the message is not queued.
+        """
+        for position in range(self.count):
+            if self.ids[self._slot(position)] == msg_id:
+                return position
+        return -1
+
+    def push(self, msg_id, text):
+        """
+        Appends a message, or updates its text if it is already queued.
+
+        Args:
+            msg_id (int): The unique identifier of the message.
+            text (str): The sanitized message text.
+
+        Returns:
+            bool: False if the queue is full, True otherwise.
+        """
+        position = self.position(msg_id)
+        if position < 0:
+            if self.is_full():
+                return False
+            position = self.count
+            self.count += 1
+        self._store(self._slot(position), msg_id, text)
+        return True
+
+    def peek(self):
+        """
+        Returns the oldest message without removing it.
+
+        Returns:
+            tuple: (id, text) of the oldest message, or (0, None) if the queue is empty.
+        """
+        if not self.count:
+            return 0, None
+        slot = self.head
+        start = slot * self.max_text_length
+        return self.ids[slot], self.texts[start:start + self.lengths[slot]].decode()
+
+    def pop(self):
+        """Removes the oldest message."""
+        if self.count:
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+
+    def remove(self, msg_id):
+        """
+        Removes a message anywhere in the queue, keeping the order of the others.
+
+        Args:
+            msg_id (int): The unique identifier of the message.
+
+        Returns:
+            int: Former 0-based position of the message, -1 if it was not queued.
+        """
+        position = self.position(msg_id)
+        if position < 0:
+            return -1
+        size = self.max_text_length
+        view = self._view
+        for later in range(position, self.count - 1):
+            dest, src = self._slot(later), self._slot(later + 1)
+            self.ids[dest] = self.ids[src]
+            self.lengths[dest] = self.lengths[src]
+            view[dest * size:(dest + 1) * size] = view[src * size:(src + 1) * size]
+        self.count -= 1
+        return position
@@ -31,6 +31,7 @@ servers for MicroPython and standard Python.
 import asyncio
 import io
 import json
+import sys
 import time
 
 try:
@@ -78,6 +79,11 @@ MUTED_SOCKET_ERRORS = [
     128,  # Operation on closed socket
 ]
 
+# MicroPython streams copy written data before awrite returns, so a write
+# buffer can be reused right away. CPython transports may keep a reference
+# to it until the data is sent.
+REUSABLE_WRITE_BUFFER = sys.implementation.name == 'micropython'
+
 
 def urldecode_str(s):
     s = s.replace('+', ' ')
@@ -317,6 +323,44 @@ class AsyncBytesIO:
         pass
 
 
+class PrefixedStream:
+    """An async stream that returns bytes that were already read from a
+    stream before reading from the stream itself."""
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    async def read(self, n=-1):
+        if not self.prefix:
+            return await self.stream.read(n)
+        if n < 0:
+            data, self.prefix = self.prefix, b''
+            return data + await self.stream.read(n)
+        data, self.prefix = self.prefix[:n], self.prefix[n:]
+        return data
+
+    async def readline(self):
+        i = self.prefix.find(b'\n')
+        if i >= 0:
+            data, self.prefix = self.prefix[:i + 1], self.prefix[i + 1:]
+            return data
+        data, self.prefix = self.prefix, b''
+        return data + await self.stream.readline()
+
+    async def readexactly(self, n):
+        data = self.prefix[:n]
+        self.prefix = self.prefix[n:]
+        if len(data) < n:
+            data += await self.stream.readexactly(n - len(data))
+        return data
+
+    async def awrite(self, data):  # pragma: no cover
+        return await self.stream.awrite(data)
+
+    async def aclose(self):  # pragma: no cover
+        return await self.stream.aclose()
+
+
 class Request:
     """An HTTP request."""
     #: Specify the maximum payload size that is accepted. Requests with larger
@@ -348,6 +392,27 @@ class Request:
     #:    Request.max_readline = 16 * 1024  # 16KB lines allowed
     max_readline = 2 * 1024
 
+    #: Specify the maximum size of the request line and headers together.
+    #: Requests with larger headers are rejected with a 400 status code.
+    #:
+    #: Example::
+    #:
+    #:    Request.max_header_length = 4 * 1024  # 4KB of headers allowed
+    max_header_length = 2 * 1024
+
+    #: Specify the lowercase names of the headers that are stored in
+    #: ``headers``, or ``None`` to store all of them. Other headers are skipped
+    #: without decoding their values. ``Content-Length`` is always parsed.
+    #:
+    #: Example::
+    #:
+    #:    Request.kept_headers = ('content-length', 'content-type')
+    kept_headers = None
+
+    #: Number of bytes requested from the stream per read while the request
+    #: line and headers are received.
+    header_chunk_size = 512
+
     class G:
         pass
 
@@ -416,8 +481,27 @@ class Request:
         This method is a coroutine. It returns a newly created ``Request``
         object.
         """
+        # request line and headers, read in chunks instead of line by line
+        data = b''
+        while True:
+            end, separator = Request._find_header_end(data)
+            if end >= 0:
+                break
+            if len(data) > Request.max_header_length:
+                raise ValueError('headers too long')
+            chunk = await client_reader.read(Request.header_chunk_size)
+            if not chunk:
+                if not data.strip():  # pragma: no cover
+                    return None
+                raise ValueError('incomplete headers')
+            data += chunk
+        if end > Request.max_header_length:
+            raise ValueError('headers too long')
+        rest = data[end + separator:]
+        lines = data[:end].split(b'\n')
+
         # request line
-        line = (await Request._safe_readline(client_reader)).strip().decode()
+        line = lines[0].strip().decode()
         if not line:  # pragma: no cover
             return None
         method, url, http_version = line.split()
@@ -426,29 +510,37 @@ class Request:
         # headers
         headers = NoCaseDict()
         content_length = 0
-        while True:
-            line = (await Request._safe_readline(
-                client_reader)).strip().decode()
-            if line == '':
-                break
-            header, value = line.split(':', 1)
-            value = value.strip()
-            headers[header] = value
-            if header.lower() == 'content-length':
-                content_length = int(value)
-
-        # body
-        body = b''
+        kept_headers = Request.kept_headers
+        for i in range(1, len(lines)):
+            line = lines[i]
+            colon = line.find(b':')
+            if colon < 0:
+                raise ValueError('invalid header')
+            # header names are stored lowercase, so NoCaseDict needs no key map
+            header = line[:colon].strip().lower().decode()
+            if header == 'content-length':
+                content_length = int(line[colon + 1:].strip())
+            elif kept_headers is not None and header not in kept_headers:
+                continue
+            headers[header] = line[colon + 1:].strip().decode()
+
+        # body, part of which may already be in the header buffer
         if content_length and content_length <= Request.max_body_length:
-            body = await client_reader.readexactly(content_length)
-            stream = None
+            body = rest[:content_length]
+            if len(body) < content_length:
+                body += await client_reader.readexactly(
+                    content_length - len(body))
+            rest = rest[content_length:]
         else:
             body = b''
-            stream = client_reader
+        # bytes read past the headers and body stay in front of the socket
+        reader = PrefixedStream(rest, client_reader) if rest \
+            else client_reader
+        stream = None if body else reader
 
         return Request(app, client_addr, method, url, http_version, headers,
                        body=body, stream=stream,
-                       sock=(client_reader, client_writer))
+                       sock=(reader, client_writer))
 
     def _parse_urlencoded(self, urlencoded):
         data = MultiDict()
@@ -529,6 +621,14 @@ class Request:
         self.after_request_handlers.append(f)
         return f
 
+    @staticmethod
+    def _find_header_end(data):
+        end = data.find(b'\r\n\r\n')
+        lf_end = data.find(b'\n\n')
+        if lf_end >= 0 and (end < 0 or lf_end < end):
+            return lf_end, 2
+        return end, 4
+
     @staticmethod
     async def _safe_readline(stream):
         line = (await stream.readline())
@@ -565,6 +665,14 @@ class Response:
 
     send_file_buffer_size = 1024
 
+    #: Responses with a byte body whose status line, headers and body fit in
+    #: this many bytes are assembled in a preallocated buffer and sent with a
+    #: single write. Larger responses send the status line and headers with
+    #: one write and stream the body.
+    write_buffer_size = 1024
+    _write_buffer = None
+    _write_buffer_busy = False
+
     #: The content type to use for responses that do not explicitly define a
     #: ``Content-Type`` header.
     default_content_type = 'text/plain'
@@ -657,19 +765,14 @@ class Response:
         self.complete()
 
         try:
-            # status code
-            reason = self.reason if self.reason is not None else \
-                ('OK' if self.status_code == 200 else 'N/A')
-            await stream.awrite('HTTP/1.0 {status_code} {reason}\r\n'.format(
-                status_code=self.status_code, reason=reason).encode())
-
-            # headers
-            for header, value in self.headers.items():
-                values = value if isinstance(value, list) else [value]
-                for value in values:
-                    await stream.awrite('{header}: {value}\r\n'.format(
-                        header=header, value=value).encode())
-            await stream.awrite(b'\r\n')
+            head = self._head()
+            body = b'' if self.is_head else self.body
+            if isinstance(body, bytes) and \
+                    len(head) + len(body) <= Response.write_buffer_size:
+                # small response, status line, headers and body in one write
+                await Response._write_small(stream, head, body)
+                return
+            await stream.awrite(head)
 
             # body
             if not self.is_head:
@@ -695,6 +798,37 @@ class Response:
             else:
                 raise
 
+    def _head(self):
+        # status line, headers and blank line, joined into a single bytes
+        reason = self.reason if self.reason is not None else \
+            ('OK' if self.status_code == 200 else 'N/A')
+        parts = ['HTTP/1.0 ', str(self.status_code), ' ', reason, '\r\n']
+        for header, value in self.headers.items():
+            values = value if isinstance(value, list) else [value]
+            for value in values:
+                parts.extend((header, ': ', str(value), '\r\n'))
+        parts.append('\r\n')
+        return ''.join(parts).encode()
+
+    @staticmethod
+    async def _write_small(stream, head, body):
+        size = len(head) + len(body)
+        if Response._write_buffer_busy or not REUSABLE_WRITE_BUFFER:
+            # buffer in use by another response, or not reusable on this port
+            await stream.awrite(head + body)
+            return
+        buf = Response._write_buffer
+        if buf is None or len(buf) != Response.write_buffer_size:
+            buf = Response._write_buffer = bytearray(
+                Response.write_buffer_size)
+        Response._write_buffer_busy = True
+        try:
+            buf[:len(head)] = head
+            buf[len(head):size] = body
+            await stream.awrite(memoryview(buf)[:size])
+        finally:
+            Response._write_buffer_busy = False
+
     def body_iter(self):
         if hasattr(self.body, '__anext__'):
             # response body is an async generator
@@ -857,6 +991,11 @@ class URLPattern():
             else:
                 pattern += '/' + segment
                 self.segments.append({'parser': self._static_segment(segment)})
+        #: The path matched by a pattern without dynamic components, or
+        #: ``None`` if the pattern has dynamic components.
+        self.static_path = None
+        if not any('name' in segment for segment in self.segments):
+            self.static_path = '/' + url_pattern.lstrip('/')
         if use_regex:
             import re
             self.regex = re.compile('^' + pattern + '$')
@@ -940,6 +1079,10 @@ class Microdot:
 
     def __init__(self):
         self.url_map = []
+        # routes without dynamic components, looked up by path
+        self.static_routes = {}
+        # routes with dynamic components, matched in order
+        self.dynamic_routes = []
         self.before_request_handlers = []
         self.after_request_handlers = []
         self.after_error_request_handlers = []
@@ -980,12 +1123,19 @@ class Microdot:
                 return 'Hello, world!'
         """
         def decorated(f):
-            self.url_map.append(
-                ([m.upper() for m in (methods or ['GET'])],
-                 URLPattern(url_pattern), f))
+            self._add_route([m.upper() for m in (methods or ['GET'])],
+                            URLPattern(url_pattern), f)
             return f
         return decorated
 
+    def _add_route(self, methods, pattern, handler):
+        self.url_map.append((methods, pattern, handler))
+        if pattern.static_path is not None:
+            self.static_routes.setdefault(pattern.static_path, []).append(
+                (methods, handler))
+        else:
+            self.dynamic_routes.append((methods, pattern, handler))
+
     def get(self, url_pattern):
         """Decorator that is used to register a function as a ``GET`` request
         handler for a given URL.
@@ -1157,9 +1307,9 @@ class Microdot:
         :param url_prefix: The URL prefix to mount the application under.
         """
         for methods, pattern, handler in subapp.url_map:
-            self.url_map.append(
-                (methods, URLPattern(url_prefix + pattern.url_pattern),
-                 handler))
+            self._add_route(methods,
+                            URLPattern(url_prefix + pattern.url_pattern),
+                            handler)
         for handler in subapp.before_request_handlers:
             self.before_request_handlers.append(handler)
         for handler in subapp.after_request_handlers:
@@ -1329,7 +1479,16 @@ class Microdot:
         if method == 'HEAD':
             method = 'GET'
         f = 404
-        for route_methods, route_pattern, route_handler in self.url_map:
+        # static routes take precedence and are found without matching
+        routes = self.static_routes.get(req.path)
+        if routes:
+            req.url_args = {}
+            for route_methods, route_handler in routes:
+                if method in route_methods:
+                    return route_handler
+            f = 405
+        for route_methods, route_pattern, route_handler in \
+                self.dynamic_routes:
             req.url_args = route_pattern.match(req.path)
             if req.url_args is not None:
                 if method in route_methods:
@@ -0,0 +1,149 @@
+# Copyright (c) 2025 Simon Klenk
+# This software is licensed under the MIT License.
+# See the LICENSE file in the project directory for the full license text.
+
+import os
+import struct
+import uasyncio
+
+RECORD_FORMAT = "<IB"  # Message id, status index
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+STATUSES = ("approved", "rejected")
+
+
+class Outbox:
+    """
+    Flash-backed queue of status updates that still have to reach the backend.
+
+    Every update is appended as a 5-byte record to a log file before it is
+    sent, so decisions made while the backend or Wi-Fi is down survive a
+    reboot. To keep flash writes low new updates are appended to the log, it
+    is deleted once every update was delivered. It is only rewritten with
+    the undelivered updates when an update is delivered while others still
+    wait or the oldest one is dropped, so the log never holds updates that
+    would be sent again after a reboot. Delivery runs in order with
+    exponential backoff.
+
+    Attributes:
+        pending (list): (message id, status) tuples not yet delivered, oldest first.
+        sending (tuple): The pending record that is being sent, None between sends.
+    """
+    def __init__(self, send, path="outbox.bin", max_records=64, min_backoff=0.5, max_backoff=10):
+        """
+        Initializes the outbox and loads updates left over from before a reboot.
+
+        Args:
+            send (coroutine function): Called with message id and status, returns True once delivered.
+            path (str, optional): Log file on flash. Defaults to "outbox.bin".
+            max_records (int, optional): Maximum number of records in the log. Defaults to 64.
+            min_backoff (float, optional): First retry delay in seconds. Defaults to 0.5.
+            max_backoff (float, optional): Longest retry delay in seconds. Defaults to 10.
+        """
+        self.send = send
+        self.path = path
+        self.max_records = max_records
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.pending = []
+        self.sending = None
+        self.records = 0  # Records in the log file, delivered ones included
+        self.event = uasyncio.Event()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                while True:
+                    record = f.read(RECORD_SIZE)
+                    if len(record) < RECORD_SIZE:
+                        break
+                    msg_id, status = struct.unpack(RECORD_FORMAT, record)
+                    self.pending.append((msg_id, STATUSES[status]))
+                    self.records += 1
+        except OSError:
+            return
+        if self.pending:
+            print("Outbox loaded", len(self.pending), "status updates")
+
+    def _compact(self):
+        try:
+            with open(self.path, "wb") as f:
+                for msg_id, status in self.pending:
+                    f.write(struct.pack(RECORD_FORMAT, msg_id, STATUSES.index(status)))
+            self.records = len(self.pending)
+        except OSError as e:
+            print("Error compacting outbox:", e)
+
+    def put(self, msg_id, status):
+        """
+        Stores a status update on flash and wakes the delivery task.
+
+        If the outbox is full, the oldest update is dropped. The update that
+        is being sent right now is never dropped, the next oldest one goes
+        instead.
+
+        Args:
+            msg_id (int): The unique identifier of the message.
+            status (str): "approved" or "rejected".
+        """
+        dropped = False
+        if len(self.pending) >= self.max_records:
+            index = 1 if self.pending and self.pending[0] is self.sending else 0
+            if index < len(self.pending):
+                print("Outbox full, dropping status update for", self.pending.pop(index)[0])
+                dropped = True
+        if dropped or self.records >= self.max_records:
+            self._compact()
+        try:
+            with open(self.path, "ab") as f:
+                f.write(struct.pack(RECORD_FORMAT, msg_id, STATUSES.index(status)))
+            self.records += 1
+        except OSError as e:
+            print("Error writing outbox:", e)
+        self.pending.append((msg_id, status))
+        self.event.set()
+
+    def _delivered(self, record):
+        # Removed by identity, an equal update may have been queued again
+        for index, queued in enumerate(self.pending):
+            if queued is record:
+                del self.pending[index]
+                break
+        else:
+            return
+        if self.pending:
+            # Drop the delivered record from the log, a reboot would send it again
+            self._compact()
+            return
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.records = 0
+
+    async def run(self):
+        """
+        Delivers the stored updates in order.
+
+        A failed delivery is retried after min_backoff seconds, doubling up to
+        max_backoff while the backend stays unreachable.
+        """
+        delay = self.min_backoff
+        while True:
+            if not self.pending:
+                self.event.clear()
+                await self.event.wait()
+                continue
+            record = self.sending = self.pending[0]
+            try:
+                delivered = await self.send(*record)
+            except Exception as e:
+                print("Error sending status:", e)
+                delivered = False
+            self.sending = None
+            if delivered:
+                self._delivered(record)
+                delay = self.min_backoff
+            else:
+                await uasyncio.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
@@ -85,6 +85,61 @@ _SET_SEG_REMAP       = const(0xa0)
 _LOW_COLUMN_ADDRESS  = const(0x00)
 _HIGH_COLUMN_ADDRESS = const(0x10)
 _SET_PAGE_ADDRESS    = const(0xB0)
+_COLUMN_OFFSET       = const(2)     # The 128 visible columns start at RAM column 2
+_BLOCK               = const(32)    # dirty spans are sent in whole blocks of columns
+
+
+def remap_rotate90(db, rb, w, p):
+    # byte-for-byte remap of the HMSB render buffer into the VLSB display buffer
+    i = 0
+    for col in range(w):
+        for page in range(p):
+            db[w * page + col] = rb[i]
+            i += 1
+
+
+def first_dirty(db, sb, start, width):
+    # first column of a page that differs from the transmitted frame,
+    # -1 if the page is unchanged
+    first = 0
+    while first < width and db[start + first] == sb[start + first]:
+        first += 1
+    return first if first < width else -1
+
+
+def last_dirty(db, sb, start, width):
+    # last column of a page that differs, only called for changed pages
+    last = width - 1
+    while db[start + last] == sb[start + last]:
+        last -= 1
+    return last
+
+
+def copy_span(dst, src, n):
+    # copy n bytes between two spans of equal length, the viper version
+    # does it without allocating a slice
+    dst[:n] = src
+
+
+# pure-Python kernels, replaced by the viper versions where available
+_python_kernels = (remap_rotate90, first_dirty, last_dirty, copy_span)
+try:
+    import kernels
+    _native_kernels = (kernels.remap_rotate90, kernels.first_dirty, kernels.last_dirty,
+                       kernels.copy_span)
+except Exception:
+    _native_kernels = None
+
+
+def use_native(flag=True):
+    # select the viper or pure-Python kernels, returns whether viper is used
+    global remap_rotate90, first_dirty, last_dirty, copy_span
+    native = flag and _native_kernels is not None
+    remap_rotate90, first_dirty, last_dirty, copy_span = _native_kernels if native else _python_kernels
+    return native
+
+
+use_native()
 
 
 class SH1106(framebuf.FrameBuffer):
@@ -99,6 +154,9 @@ class SH1106(framebuf.FrameBuffer):
         self.bufsize = self.pages * self.width
         self.renderbuf = bytearray(self.bufsize)
         self.pages_to_update = 0
+        # copy of what the controller RAM holds, show() only sends the difference
+        self.sentbuf = bytearray(self.bufsize)
+        self.bytes_sent = 0
 
         if self.rotate90:
             self.displaybuf = bytearray(self.bufsize)
@@ -112,6 +170,22 @@ class SH1106(framebuf.FrameBuffer):
             super().__init__(self.renderbuf, self.width, self.height,
                              framebuf.MONO_VLSB)
 
+        # memoryviews of every block-aligned column span of every page, and of
+        # the same span of sentbuf, created once so that show() does not
+        # allocate while sending partial pages
+        self.blocks = (self.width + _BLOCK - 1) // _BLOCK
+        view = memoryview(self.displaybuf)
+        sent = memoryview(self.sentbuf)
+        self.spans = [None] * (self.pages * self.blocks * self.blocks)
+        self.sent_spans = [None] * (self.pages * self.blocks * self.blocks)
+        for page in range(self.pages):
+            for b0 in range(self.blocks):
+                for b1 in range(b0, self.blocks):
+                    start = self.width * page + b0 * _BLOCK
+                    end = self.width * page + min((b1 + 1) * _BLOCK, self.width)
+                    self.spans[(page * self.blocks + b0) * self.blocks + b1] = view[start:end]
+                    self.sent_spans[(page * self.blocks + b0) * self.blocks + b1] = sent[start:end]
+
         # flip() was called rotate() once, provide backwards compatibility.
         self.rotate = self.flip
         self.init_display()
@@ -155,24 +229,49 @@ class SH1106(framebuf.FrameBuffer):
 
     def show(self, full_update = False):
         # self.* lookups in loops take significant time (~4fps).
-        (w, p, db, rb) = (self.width, self.pages,
-                          self.displaybuf, self.renderbuf)
+        # Plain assignments, a tuple of 4 would be built on the heap every frame.
+        w = self.width
+        p = self.pages
+        db = self.displaybuf
+        rb = self.renderbuf
         if self.rotate90:
-            for i in range(self.bufsize):
-                db[w * (i % p) + (i // p)] = rb[i]
+            remap_rotate90(db, rb, w, p)
         if full_update:
             pages_to_update = (1 << self.pages) - 1
         else:
             pages_to_update = self.pages_to_update
         #print("Updating pages: {:08b}".format(pages_to_update))
-        for page in range(self.pages):
+        # pages marked dirty are diffed against the last transmitted frame and
+        # only the blocks holding changed columns are sent, using column addressing
+        sb = self.sentbuf
+        spans = self.spans
+        sent_spans = self.sent_spans
+        nb = self.blocks
+        for page in range(p):
             if (pages_to_update & (1 << page)):
-                self.write_cmd(_SET_PAGE_ADDRESS | page)
-                self.write_cmd(_LOW_COLUMN_ADDRESS | 2)
-                self.write_cmd(_HIGH_COLUMN_ADDRESS | 0)
-                self.write_data(db[(w*page):(w*page+w)])
+                start = w * page
+                if full_update:
+                    first = 0
+                    last = w - 1
+                else:
+                    first = first_dirty(db, sb, start, w)
+                    if first < 0:
+                        continue
+                    last = last_dirty(db, sb, start, w)
+                b0 = first // _BLOCK
+                index = (page * nb + b0) * nb + last // _BLOCK
+                span = spans[index]
+                self.write_page(page, b0 * _BLOCK + _COLUMN_OFFSET, span)
+                copy_span(sent_spans[index], span, len(span))
+                self.bytes_sent += len(span)
         self.pages_to_update = 0
 
+    def write_page(self, page, col, buf):
+        self.write_cmd(_SET_PAGE_ADDRESS | page)
+        self.write_cmd(_LOW_COLUMN_ADDRESS | (col & 0x0f))
+        self.write_cmd(_HIGH_COLUMN_ADDRESS | (col >> 4))
+        self.write_data(buf)
+
     def pixel(self, x, y, color=None):
         if color is None:
             return super().pixel(x, y)
@@ -247,6 +346,10 @@ class SH1106_I2C(SH1106):
         self.addr = addr
         self.res = res
         self.temp = bytearray(2)
+        # Co=0, D/C#=0 followed by page and column address in one transfer
+        self.page_cmd = bytearray(4)
+        # control byte and page data are written as one transfer without concatenating
+        self.data_vec = [b'\x40', None]
         self.delay = delay
         if res is not None:
             res.init(res.OUT, value=1)
@@ -258,7 +361,17 @@ class SH1106_I2C(SH1106):
         self.i2c.writeto(self.addr, self.temp)
 
     def write_data(self, buf):
-        self.i2c.writeto(self.addr, b'\x40'+buf)
+        self.data_vec[1] = buf
+        self.i2c.writevto(self.addr, self.data_vec)
+        self.data_vec[1] = None
+
+    def write_page(self, page, col, buf):
+        cmd = self.page_cmd
+        cmd[1] = _SET_PAGE_ADDRESS | page
+        cmd[2] = _LOW_COLUMN_ADDRESS | (col & 0x0f)
+        cmd[3] = _HIGH_COLUMN_ADDRESS | (col >> 4)
+        self.i2c.writeto(self.addr, cmd)
+        self.write_data(buf)
 
     def reset(self):
         super().reset(self.res)